@@ -45,24 +45,56 @@ def check_pyinstaller():
         subprocess.run([sys.executable, '-m', 'pip', 'install', 'pyinstaller'], check=True)
         print("✅ PyInstaller installed")
 
+def bake_assets():
+    """Bake the sprite atlas for the window size in code/settings.py"""
+    print("🧱 Baking sprite atlas...")
+    try:
+        subprocess.run([sys.executable, 'bake.py'], cwd='code', check=True)
+        print("   ✅ Atlas baked")
+    except subprocess.CalledProcessError as e:
+        print(f"   ⚠️  Warning: Atlas bake failed ({e}), the game will load the source images")
+
+def build_asset_pack():
+    """Pack graphics/, sounds/ and data/ into the one file shipped next to the executable"""
+    print("📦 Building asset pack...")
+    pack_path = os.path.join('build', 'assets.pak')
+    os.makedirs('build', exist_ok=True)
+    try:
+        subprocess.run([sys.executable, os.path.join('code', 'pack.py'), pack_path], check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Asset pack failed: {e}")
+        return None
+    return pack_path
+
+def install_asset_pack(pack_path):
+    """Copy the pack next to each executable, where frozen builds look for it"""
+    # the one-file exe sits in dist/, one-dir builds and the macOS app in their own folders
+    for executable in ['dist/FlappyBird.exe', 'dist/FlappyBird/FlappyBird', 'dist/FlappyBird/FlappyBird.exe',
+                       'dist/FlappyBird.app/Contents/MacOS/FlappyBird']:
+        if os.path.exists(executable):
+            folder = os.path.dirname(executable)
+            shutil.copy2(pack_path, folder)
+            print(f"   ✅ assets.pak copied to {folder}/")
+
+def pyinstaller_args():
+    """PyInstaller options: the code only, the assets stay in the pack outside the bundle"""
+    current_platform = platform.system()
+    # no --add-data: a one-file build unpacks every data file to a temp folder on each launch
+    args = ['--noconfirm', '--name', 'FlappyBird', '--windowed', '--paths', 'code']
+    if current_platform == "Windows":
+        args.append('--onefile')
+    icon = 'icon.ico' if current_platform == "Windows" else 'icon.icns'
+    if os.path.exists(icon):
+        args += ['--icon', icon]
+    return args + [os.path.join('code', 'main.py')]
+
 def build_executable():
     """Build executable for current platform"""
     current_platform = platform.system()
     print(f"🔨 Building for {current_platform}...")
     
-    if current_platform == "Windows":
-        spec_file = "FlappyBird-windows.spec"
-        print("   Using Windows configuration...")
-    else:
-        spec_file = "FlappyBird.spec"  # Default spec works for macOS/Linux
-        print("   Using macOS/Linux configuration...")
-    
-    if not os.path.exists(spec_file):
-        print(f"❌ Spec file {spec_file} not found!")
-        return False
-    
     try:
-        subprocess.run([sys.executable, '-m', 'PyInstaller', spec_file], check=True)
+        subprocess.run([sys.executable, '-m', 'PyInstaller'] + pyinstaller_args(), check=True)
         print(f"✅ Build completed successfully for {current_platform}")
         return True
     except subprocess.CalledProcessError as e:
@@ -105,10 +137,17 @@ def main():
     # Check PyInstaller
     check_pyinstaller()
     
+    # Pre-scaled sprites and collision masks
+    bake_assets()
+    
+    # Assets ship as one pack next to the executable, never inside it
+    pack_path = build_asset_pack()
+    
     # Build
-    success = build_executable()
+    success = pack_path is not None and build_executable()
     
     if success:
+        install_asset_pack(pack_path)
         list_outputs()
         print("\n🎉 Build completed successfully!")
         print("\n📖 To run your game:")
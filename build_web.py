@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Web build for FlappyBird (pygbag)
+
+Splits the game in two so the start screen shows up as early as possible:
+- build/web_boot/: the boot bundle pygbag packages, the code and the font
+  (all the start screen needs) plus boot.json naming the gameplay pack
+- build/gameplay.pak: every other asset, PNGs recompressed and sounds as OGG,
+  fetched by the game while the start screen is up (see code/remote.py)
+
+The gameplay pack is also copied to build/web_boot/build/web/, where pygbag
+writes index.html (and which it leaves out of the bundle), so a local run of
+the staged bundle fetches it from the same place as the page. Run with
+--pygbag to also run pygbag on the boot bundle.
+"""
+
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import zlib
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'code'))
+
+from settings import BOOT_MANIFEST, WEB_PACK
+from pack import asset_files, write_pack
+
+BOOT_DIR = os.path.join('build', 'web_boot')
+ASSETS_DIR = os.path.join('build', 'web_assets')
+PACK_PATH = os.path.join('build', WEB_PACK)
+# pygbag's output folder, the pack is served from next to its index.html
+WEB_DIR = os.path.join(BOOT_DIR, 'build', 'web')
+
+# everything the start screen draws, the rest goes in the gameplay pack
+BOOT_ASSETS = ['graphics/font/BD_Cartoon_Shout.ttf']
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# chunks the decoder needs, ancillary ones (text, time, colour profiles) are dropped
+PNG_KEEP = {b'IHDR', b'PLTE', b'tRNS', b'IDAT', b'IEND'}
+
+def png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def recompress_png(data):
+    """Same pixels, image data deflated at the highest level, metadata dropped"""
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    chunks = []
+    pixels = b''
+    position = len(PNG_SIGNATURE)
+    while position < len(data):
+        length, kind = struct.unpack_from('>I4s', data, position)
+        body = data[position + 8:position + 8 + length]
+        position += 12 + length
+        if kind == b'IDAT':
+            pixels += body
+        elif kind in PNG_KEEP:
+            chunks.append((kind, body))
+    out = PNG_SIGNATURE
+    for kind, body in chunks:
+        if kind == b'IEND':
+            out += png_chunk(b'IDAT', zlib.compress(zlib.decompress(pixels), 9))
+        out += png_chunk(kind, body)
+    # never make a file bigger
+    return out if len(out) < len(data) else data
+
+def stage_boot_bundle():
+    """Copy the code and the start screen's assets into the boot bundle"""
+    print("🥾 Staging boot bundle...")
+    code_dir = os.path.join(BOOT_DIR, 'code')
+    os.makedirs(code_dir)
+    for name in os.listdir('code'):
+        if name.endswith('.py'):
+            shutil.copy2(os.path.join('code', name), code_dir)
+    for path in BOOT_ASSETS:
+        target = os.path.join(BOOT_DIR, *path.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(path, target)
+    # pygbag starts main.py at the top of the bundle
+    with open(os.path.join(BOOT_DIR, 'main.py'), 'w') as file:
+        file.write("import os, runpy, sys\n"
+                   "sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'code'))\n"
+                   "runpy.run_path(sys.path[0] + '/main_web.py', run_name='__main__')\n")
+
+def convert_sounds(files):
+    """Swap the WAVs for OGG, keeps the WAVs when the converter is not installed"""
+    try:
+        from convert_audio import convert_wav_to_ogg
+    except ImportError as e:
+        print(f"   ⚠️  Warning: No audio converter ({e}), shipping WAV files")
+        return files
+    # incremental, unchanged sounds come straight from the converter's cache
+    sounds_dir = convert_wav_to_ogg('sounds', profile='web')
+    if not sounds_dir:
+        print("   ⚠️  Warning: Audio conversion failed, shipping WAV files")
+        return files
+    for name in [name for name in files if name.endswith('.wav')]:
+        ogg = name[:-len('.wav')] + '.ogg'
+        ogg_path = os.path.join(sounds_dir, os.path.basename(ogg))
+        if os.path.exists(ogg_path):
+            del files[name]
+            files[ogg] = ogg_path
+    return files
+
+def build_gameplay_pack():
+    """Pack every asset the boot bundle leaves out"""
+    print("📦 Building gameplay pack...")
+    files = {name: path for name, path in asset_files(ROOT).items() if name not in BOOT_ASSETS}
+
+    saved = 0
+    for name, path in list(files.items()):
+        if not name.endswith('.png'):
+            continue
+        with open(path, 'rb') as file:
+            data = file.read()
+        smaller = recompress_png(data)
+        target = os.path.join(ASSETS_DIR, *name.split('/'))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as file:
+            file.write(smaller)
+        files[name] = target
+        saved += len(data) - len(smaller)
+    print(f"   ✅ Recompressed images ({saved / 1024:.0f} KB smaller)")
+
+    files = convert_sounds(files)
+    size = write_pack(PACK_PATH, files)
+
+    # the pack itself deflates well (collision masks, uncompressed audio)
+    with open(PACK_PATH, 'rb') as file:
+        data = zlib.compress(file.read(), 9)
+    with open(PACK_PATH, 'wb') as file:
+        file.write(data)
+    print(f"   ✅ {PACK_PATH}: {len(files)} files, {size / 1024:.0f} KB, {len(data) / 1024:.0f} KB compressed")
+
+    manifest = {'pack': WEB_PACK, 'size': len(data), 'compression': 'zlib'}
+    with open(os.path.join(BOOT_DIR, *BOOT_MANIFEST.split('/')), 'w') as file:
+        json.dump(manifest, file)
+
+def install_gameplay_pack():
+    """Put the gameplay pack next to index.html, where both the page and a local run fetch it"""
+    os.makedirs(WEB_DIR, exist_ok=True)
+    shutil.copy2(PACK_PATH, WEB_DIR)
+    print(f"   ✅ Copied {WEB_PACK} to {WEB_DIR}/")
+
+def run_pygbag():
+    """Package the boot bundle and put the gameplay pack next to index.html"""
+    print("🌐 Running pygbag...")
+    try:
+        subprocess.run([sys.executable, '-m', 'pygbag', '--build', BOOT_DIR], check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"   ❌ pygbag failed ({e})")
+        return False
+    # in case pygbag cleared its output folder
+    install_gameplay_pack()
+    return True
+
+def list_outputs():
+    print("\n📋 Web build:")
+    total = 0
+    for folder, folders, filenames in os.walk(BOOT_DIR):
+        # pygbag's output folder is not part of the bundle
+        if folder == BOOT_DIR and 'build' in folders:
+            folders.remove('build')
+        total += sum(os.path.getsize(os.path.join(folder, name)) for name in filenames)
+    print(f"   🥾 {BOOT_DIR}/ ({total / 1024:.0f} KB before pygbag)")
+    print(f"   📦 {PACK_PATH} ({os.path.getsize(PACK_PATH) / 1024:.0f} KB, fetched after the start screen)")
+
+def main():
+    print("🎮 FlappyBird Web Builder")
+    print("=" * 40)
+    os.chdir(ROOT)
+
+    for folder in [BOOT_DIR, ASSETS_DIR]:
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+
+    # pre-scaled sprites and collision masks go in the gameplay pack
+    from build_game import bake_assets
+    bake_assets()
+
+    stage_boot_bundle()
+    build_gameplay_pack()
+    install_gameplay_pack()
+    list_outputs()
+
+    if '--pygbag' in sys.argv[1:]:
+        if not run_pygbag():
+            sys.exit(1)
+    else:
+        print(f"\n📖 Next: pygbag {BOOT_DIR} (or run this script with --pygbag)")
+        print(f"   Local run: python {os.path.join(BOOT_DIR, 'main.py')}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import pygame, os, sys
+from settings import *
+from atlas import Atlas
+from pack import AssetPack, PackError
+
+# Get the directory where this script is located. If running from a PyInstaller
+# bundle its files are at `sys._MEIPASS`; frozen builds bundle no assets, they
+# read the asset pack shipped next to the executable (see build_game.py).
+FROZEN = getattr(sys, 'frozen', False)
+if FROZEN and hasattr(sys, '_MEIPASS'):
+    BASE_DIR = sys._MEIPASS
+else:
+    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# process-wide caches, every sprite gets the same shared objects
+_images = {}
+_sounds = {}
+_fonts = {}
+
+# baked atlas (see bake.py), loaded on first use, False when there is none
+_atlas = None
+
+# asset pack, opened on first use, False when the loose files are used
+_pack = None
+
+def asset_path(path):
+	"""Absolute path of an asset given relative to BASE_DIR with '/' separators"""
+	return os.path.join(BASE_DIR, *path.split('/'))
+
+def find_pack():
+	if ASSET_PACK_PATH:
+		return ASSET_PACK_PATH
+	# a frozen build reads the pack next to the executable, nothing is extracted
+	if FROZEN:
+		for folder in (os.path.dirname(sys.executable), BASE_DIR):
+			path = os.path.join(folder, ASSET_PACK)
+			if os.path.exists(path):
+				return path
+	return None
+
+def get_pack():
+	global _pack
+	if _pack is None:
+		path = find_pack()
+		if path is None and FROZEN:
+			# no loose files to fall back to
+			raise PackError(f'{ASSET_PACK} not found next to {sys.executable}')
+		_pack = AssetPack(path) if path else False
+	return _pack
+
+def use_pack(pack):
+	"""Read assets from this pack from now on, e.g. the web build's gameplay pack once it arrived"""
+	global _pack, _atlas
+	_pack = pack
+	# the atlas may be in the pack, look again
+	if _atlas is False:
+		_atlas = None
+
+def asset_file(path):
+	"""Filename or file object to load an asset from, a view into the asset pack when it has the file"""
+	pack = get_pack()
+	if pack and path in pack:
+		return pack.open(path)
+	return asset_path(path)
+
+def asset_exists(path):
+	pack = get_pack()
+	return bool(pack and path in pack) or os.path.exists(asset_path(path))
+
+def get_atlas():
+	global _atlas
+	if _atlas is None:
+		_atlas = Atlas.load(asset_file(ATLAS_PATH + '.json'),asset_file(ATLAS_PATH + '.png'),asset_file) or False
+	return _atlas
+
+def set_atlas(atlas):
+	"""Replace the atlas: None loads the baked one on demand, False uses the source images only"""
+	global _atlas
+	_atlas = atlas
+	_images.clear()
+
+def load_image(path,scale_factor = 1,flip = False,alpha = True):
+	"""Load, scale, flip and convert an image once; later calls share the Surface"""
+	key = (path,scale_factor,flip)
+	image = _images.get(key)
+	if image is None:
+		# pre-scaled in the baked atlas, else made from the source file
+		atlas = get_atlas()
+		if atlas:
+			image = atlas.image(path,scale_factor,flip)
+		if image is None:
+			image = _load_source_image(path,scale_factor,flip,alpha)
+		_images[key] = image
+	return image
+
+def _load_source_image(path,scale_factor,flip,alpha):
+	if scale_factor == 1 and not flip:
+		image = pygame.image.load(asset_file(path),path)
+		# headless runs (no display mode set) keep the file's pixel format
+		if pygame.display.get_surface():
+			image = image.convert_alpha() if alpha else image.convert()
+		return image
+	image = load_image(path,alpha = alpha)
+	if scale_factor != 1:
+		image = pygame.transform.scale(image,pygame.math.Vector2(image.get_size()) * scale_factor)
+	if flip:
+		image = pygame.transform.flip(image,False,True)
+	return image
+
+def compressed_sound(path):
+	"""The OGG made from a WAV when there is one, the web build ships OGG only (see convert_audio.py)"""
+	ogg = os.path.splitext(path)[0] + '.ogg'
+	return ogg if ogg != path and asset_exists(ogg) else path
+
+def load_sound(path,volume = None):
+	sound = _sounds.get(path)
+	if sound is None:
+		sound = pygame.mixer.Sound(asset_file(compressed_sound(path)))
+		if volume is not None:
+			sound.set_volume(volume)
+		_sounds[path] = sound
+	return sound
+
+def load_font(path,size):
+	key = (path,size)
+	font = _fonts.get(key)
+	if font is None:
+		font = pygame.font.Font(asset_file(path),size)
+		_fonts[key] = font
+	return font
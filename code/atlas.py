@@ -0,0 +1,112 @@
+"""Runtime side of the baked sprite atlas (bake.py writes it).
+
+The atlas is one PNG holding every image the game draws plus a JSON index with,
+per (path,scale,flip), the image's rect on the sheet, its final size and its
+collision mask. Images are sliced out of the sheet instead of being loaded one
+file at a time, and the masks feed the hitboxes without decoding any pixels.
+
+Downscaled images are stored at their final size. Upscaled ones are stored at
+source resolution and scaled when sliced, decoding the extra pixels from the
+PNG costs more than scaling them.
+
+The index records a digest of every source image; an atlas whose sources
+changed since the bake is ignored like one baked for other settings.
+"""
+import hashlib, json
+import pygame
+from settings import *
+from collision import Shape
+
+VERSION = 2
+
+def image_key(path,scale_factor,flip):
+	return (path,float(scale_factor),bool(flip))
+
+def file_digest(file):
+	"""SHA-256 of a file given as a path or a file object"""
+	if isinstance(file,str):
+		with open(file,'rb') as source:
+			return hashlib.sha256(source.read()).hexdigest()
+	return hashlib.sha256(file.read()).hexdigest()
+
+def mask_rows(shape):
+	return [format(row,'x') for row in shape.rows]
+
+def shape_from_mask(size,rows):
+	return Shape(size[0],size[1],[int(row,16) for row in rows])
+
+class Atlas:
+	def __init__(self,index,image_file):
+		self.index = index
+		self.image_file = image_file
+		self.scale_factor = index['scale_factor']
+		self.images = {image_key(entry['path'],entry['scale'],entry['flip']): entry for entry in index['images']}
+		self.rotations = {float(entry['scale']): entry['frames'] for entry in index['rotations']}
+		self.surface = None
+
+	@classmethod
+	def load(cls,index_file,image_file,source_file):
+		"""The atlas baked for the current settings and images, None if there is none or it is stale
+
+		Both files are paths or file objects (see assets.asset_file), as is
+		source_file(path) of a source image.
+		"""
+		try:
+			if isinstance(index_file,str):
+				with open(index_file,'rb') as file:
+					index = json.load(file)
+			else:
+				index = json.load(index_file)
+		except (OSError,ValueError):
+			return None
+		if (index.get('version') != VERSION
+				or index['window'] != [WINDOW_WIDTH,WINDOW_HEIGHT]
+				or index['rotation'] != [ROTATION_STEP,ROTATION_MIN_ANGLE,ROTATION_MAX_ANGLE]):
+			return None
+		# an image edited without baking again: the sources win
+		try:
+			if any(file_digest(source_file(path)) != digest for path, digest in index['sources'].items()):
+				return None
+		except OSError:
+			return None
+		return cls(index,image_file)
+
+	def sheet(self):
+		if self.surface is None:
+			self.surface = pygame.image.load(self.image_file,'atlas.png')
+			if pygame.display.get_surface():
+				self.surface = self.surface.convert_alpha()
+		return self.surface
+
+	def image(self,path,scale_factor = 1,flip = False):
+		"""The image as assets.load_image would make it, None if it was not baked"""
+		entry = self.images.get(image_key(path,scale_factor,flip))
+		if entry is None:
+			return None
+		image = self.sheet().subsurface(entry['rect'])
+		size = tuple(entry['size'])
+		if image.get_size() != size:
+			image = pygame.transform.scale(image,size)
+		if entry['flip']:
+			image = pygame.transform.flip(image,False,True)
+		# opaque images get their own copy so they blit without per-pixel alpha
+		if not entry['alpha'] and pygame.display.get_surface():
+			image = image.convert()
+		return image
+
+	def size(self,path,scale_factor = 1,flip = False):
+		entry = self.images.get(image_key(path,scale_factor,flip))
+		return tuple(entry['size']) if entry else None
+
+	def shape(self,path,scale_factor = 1,flip = False):
+		entry = self.images.get(image_key(path,scale_factor,flip))
+		if entry is None or 'mask' not in entry:
+			return None
+		return shape_from_mask(entry['size'],entry['mask'])
+
+	def rotation_shapes(self,scale_factor):
+		"""Plane masks [frame][rotation bucket], see sprites.RotationCache"""
+		frames = self.rotations.get(float(scale_factor))
+		if frames is None:
+			return None
+		return [[shape_from_mask(entry['size'],entry['mask']) for entry in buckets] for buckets in frames]
@@ -0,0 +1,105 @@
+"""Bake every sprite the game draws into one atlas for the current window size.
+
+Writes ATLAS_PATH + '.png' (the images packed on shelves) and ATLAS_PATH +
+'.json' (per image and flipped variant: sheet rect, final size and collision
+mask, plus the masks of every plane rotation). The game slices the atlas
+through atlas.Atlas and falls back to the source images when the atlas is
+missing, was baked for other settings or its source images changed, so
+rerun this after changing an image, the window size or the rotation settings.
+
+Usage: python bake.py
+"""
+import json, os, time
+import pygame
+from settings import *
+from assets import asset_file, asset_path, load_image, set_atlas
+from atlas import VERSION, file_digest, mask_rows
+from hitboxes import shape_from_surface, world_scale_factor
+from sprites import rotation_cache
+
+ATLAS_WIDTH = 1024
+PADDING = 1
+
+def baked_images(scale_factor):
+	"""(path,scale,flip,alpha,mask) of every image the game loads (sprites.py, view.py, main.py)"""
+	images = [
+		('graphics/environment/background.png',scale_factor,False,False,False),
+		('graphics/environment/ground.png',scale_factor,False,True,True),
+		('graphics/ui/menu.png',1,False,True,False)]
+	images += [(f'graphics/drone/drone{i}.png',scale_factor / 1.7,False,True,False) for i in range(3)]
+	images += [(f'graphics/obstacles/{variant}.png',scale_factor * 1.1,flip,True,True) for variant in (0,1) for flip in (False,True)]
+	return images
+
+def pack(sizes,width):
+	"""Shelf packing, tallest first; returns the rects and the sheet height"""
+	rects = [None] * len(sizes)
+	x = y = shelf = 0
+	for i in sorted(range(len(sizes)),key = lambda i: -sizes[i][1]):
+		w, h = sizes[i]
+		if x + w > width:
+			x = 0
+			y += shelf + PADDING
+			shelf = 0
+		rects[i] = [x,y,w,h]
+		x += w + PADDING
+		shelf = max(shelf,h)
+	return rects, y + shelf
+
+def bake():
+	# always from the source images, never from a previous bake
+	set_atlas(False)
+	scale_factor = world_scale_factor()
+
+	# one sheet image per (path,stored scale): never more pixels than the source,
+	# flipped variants share the unflipped pixels
+	stored = {}
+	images = []
+	for path, scale, flip, alpha, mask in baked_images(scale_factor):
+		image = load_image(path,scale,flip,alpha)
+		key = (path,min(scale,1))
+		if key not in stored:
+			stored[key] = load_image(path,key[1],alpha = alpha)
+		entry = {'path': path, 'scale': scale, 'flip': flip, 'alpha': alpha, 'size': list(image.get_size()), 'sheet': key}
+		if mask:
+			entry['mask'] = mask_rows(shape_from_surface(image))
+		images.append(entry)
+
+	keys = list(stored)
+	width = max([ATLAS_WIDTH] + [surface.get_width() for surface in stored.values()])
+	rects, height = pack([stored[key].get_size() for key in keys],width)
+	sheet = pygame.Surface((width,height),pygame.SRCALPHA)
+	for key, rect in zip(keys,rects):
+		sheet.blit(stored[key],rect[:2])
+	for entry in images:
+		entry['rect'] = rects[keys.index(entry.pop('sheet'))]
+
+	# plane rotations are rendered at runtime, only their masks are baked
+	rotations = []
+	for scale in (scale_factor / 1.7,):
+		frames = [[{'size': list(image.get_size()), 'mask': mask_rows(shape_from_surface(image))} for image in buckets]
+			for buckets in rotation_cache(scale).images]
+		rotations.append({'scale': scale, 'frames': frames})
+
+	index = {
+		'version': VERSION,
+		'window': [WINDOW_WIDTH,WINDOW_HEIGHT],
+		'rotation': [ROTATION_STEP,ROTATION_MIN_ANGLE,ROTATION_MAX_ANGLE],
+		'scale_factor': scale_factor,
+		'sources': {path: file_digest(asset_file(path)) for path in sorted({entry['path'] for entry in images})},
+		'images': images,
+		'rotations': rotations}
+	base = asset_path(ATLAS_PATH)
+	pygame.image.save(sheet,base + '.png')
+	with open(base + '.json','w') as file:
+		json.dump(index,file,separators = (',',':'))
+	return base, len(images), sheet.get_size()
+
+def main():
+	start = time.perf_counter()
+	base, count, (width, height) = bake()
+	print(f'🧱 baked {count} images into a {width}x{height} atlas in {time.perf_counter() - start:.2f}s')
+	for suffix in ('.png','.json'):
+		print(f'   {base + suffix} ({os.path.getsize(base + suffix) / 1024:.0f} KB)')
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,255 @@
+"""Vectorized environment: N independent games stepped together with NumPy.
+
+Physics, obstacle speeds and spawn ranges are the ones simulation.py uses;
+there is no quiz, an episode ends at the first crash and the env resets
+itself. Collisions are exact against the same hitboxes, using tables
+precomputed from the masks: obstacles have one solid run per row and the
+ground is a height field, so a crash test is a handful of gathers.
+
+	env = BatchEnv(4096,seed = 1)
+	obs = env.reset()
+	obs, rewards, dones = env.step(obs[:,0] > 420)
+"""
+import math
+import numpy as np
+from settings import *
+from hitboxes import load_hitboxes
+
+# observation columns
+OBS_PLANE_Y, OBS_PLANE_VELOCITY, OBS_NEXT_DX, OBS_NEXT_Y, OBS_NEXT_FLIP, OBS_AFTER_DX, OBS_AFTER_Y, OBS_AFTER_FLIP = range(8)
+
+def shape_bits(shape,width,height):
+	"""Shape rows as a (height,width) bool array, zero padded"""
+	bits = np.zeros((height,width),dtype = bool)
+	row_bytes = (shape.width + 7) // 8
+	for y, row in enumerate(shape.rows):
+		unpacked = np.unpackbits(np.frombuffer(row.to_bytes(row_bytes,'little'),dtype = np.uint8),bitorder = 'little')
+		bits[y,:shape.width] = unpacked[:shape.width]
+	return bits
+
+class CollisionTables:
+	"""Mask data reshaped so collisions can be tested for many games at once"""
+	def __init__(self,hitboxes):
+		# plane shapes indexed by frame * buckets + bucket
+		shapes = [shape for frame in hitboxes.plane for shape in frame]
+		self.buckets = len(hitboxes.plane[0])
+		self.plane_width = max(shape.width for shape in shapes)
+		self.plane_height = max(shape.height for shape in shapes)
+		self.plane_widths = np.array([shape.width for shape in shapes])
+		self.plane_heights = np.array([shape.height for shape in shapes])
+		bits = np.stack([shape_bits(shape,self.plane_width,self.plane_height) for shape in shapes])
+
+		# prefix[p,row,col] = solid pixels of plane shape p in row left of col
+		self.prefix = np.zeros((len(shapes),self.plane_height,self.plane_width + 1),dtype = np.int16)
+		np.cumsum(bits,axis = 2,out = self.prefix[:,:,1:])
+
+		# per column: first and last solid row (-1 / height when the column is empty)
+		solid = bits.any(axis = 1)
+		self.plane_top = np.where(solid,bits.argmax(axis = 1),self.plane_height)
+		self.plane_bottom = np.where(solid,self.plane_height - 1 - bits[:,::-1,:].argmax(axis = 1),-1)
+
+		# obstacles indexed by variant * 2 + flip: solid run [left,right) per row
+		obstacles = [hitboxes.obstacles[(variant,flip)] for variant in (0,1) for flip in (False,True)]
+		self.obstacle_width = obstacles[0].width
+		self.obstacle_height = obstacles[0].height
+		self.obstacle_left = np.zeros((4,self.obstacle_height),dtype = np.int32)
+		self.obstacle_right = np.zeros((4,self.obstacle_height),dtype = np.int32)
+		for index, shape in enumerate(obstacles):
+			obstacle_bits = shape_bits(shape,shape.width,shape.height)
+			solid = obstacle_bits.any(axis = 1)
+			self.obstacle_left[index] = np.where(solid,obstacle_bits.argmax(axis = 1),0)
+			self.obstacle_right[index] = np.where(solid,shape.width - obstacle_bits[:,::-1].argmax(axis = 1),0)
+
+		# ground: first solid row per column, the ground is solid below it
+		ground_bits = shape_bits(hitboxes.ground,hitboxes.ground.width,hitboxes.ground.height)
+		self.ground_width = hitboxes.ground.width
+		self.ground_height = hitboxes.ground.height
+		self.ground_top = np.where(ground_bits.any(axis = 0),ground_bits.argmax(axis = 0),self.ground_height)
+
+class BatchEnv:
+	def __init__(self,num_envs,seed = None,hitboxes = None,tick_rate = TICK_RATE):
+		hitboxes = hitboxes or load_hitboxes()
+		self.tables = CollisionTables(hitboxes)
+		self.num_envs = num_envs
+		self.rng = np.random.default_rng(seed)
+		self.dt = 1 / tick_rate
+		self.tick_rate = tick_rate
+
+		# plane start (see simulation.PlaneBody)
+		plane_width, plane_height = hitboxes.plane_size
+		self.plane_x = round(WINDOW_WIDTH / 20)
+		self.start_y = round(WINDOW_HEIGHT / 2) - plane_height // 2
+		self.frame_count = len(hitboxes.plane)
+		self.ground_y = WINDOW_HEIGHT - hitboxes.ground.height
+
+		# enough obstacle slots for everything that can be on screen at once
+		lifetime = (WINDOW_WIDTH + 100 + self.tables.obstacle_width + 100) / OBSTACLE_SPEED
+		slots = math.ceil(lifetime / OBSTACLE_SPAWN_INTERVAL) + 1
+
+		n = num_envs
+		self.plane_y = np.zeros(n)
+		self.plane_rect_y = np.zeros(n,dtype = np.int64)
+		self.velocity = np.zeros(n)
+		self.frame_index = np.zeros(n)
+		self.ground_x = np.zeros(n)
+		self.ground_rect_x = np.zeros(n,dtype = np.int64)
+		self.spawn_timer = np.zeros(n)
+		self.ticks = np.zeros(n,dtype = np.int64)
+		self.obstacle_x = np.zeros((n,slots))
+		self.obstacle_rect_x = np.zeros((n,slots),dtype = np.int64)
+		self.obstacle_y = np.zeros((n,slots),dtype = np.int64)
+		self.obstacle_kind = np.zeros((n,slots),dtype = np.int64)
+		self.obstacle_active = np.zeros((n,slots),dtype = bool)
+		self.observation = np.zeros((n,8),dtype = np.float32)
+		self.all_envs = np.arange(n)
+
+		# finished episodes, for the caller's statistics
+		self.episode_ticks = np.zeros(n,dtype = np.int64)
+
+	def reset(self):
+		self.reset_envs(self.all_envs)
+		return self.observe()
+
+	def reset_envs(self,envs):
+		self.plane_y[envs] = self.start_y
+		self.plane_rect_y[envs] = self.start_y
+		self.velocity[envs] = 0
+		self.frame_index[envs] = 0
+		self.ground_x[envs] = 0
+		self.ground_rect_x[envs] = 0
+		self.spawn_timer[envs] = 0
+		self.ticks[envs] = 0
+		self.obstacle_active[envs] = False
+
+	def spawn(self,envs):
+		"""Spawn one obstacle in each of envs, re-rolled like ObstacleBody.spawn"""
+		active = self.obstacle_active[envs]
+		# first free slot, or the obstacle that is furthest along when all are taken
+		slot = np.where(active.all(axis = 1),self.obstacle_x[envs].argmin(axis = 1),(~active).argmax(axis = 1))
+
+		count = len(envs)
+		flip = self.rng.integers(0,2,count).astype(bool)
+		variant = self.rng.integers(0,2,count)
+		x = WINDOW_WIDTH + self.rng.integers(40,101,count) - self.tables.obstacle_width // 2
+		y = np.where(flip,self.rng.integers(-50,-9,count),WINDOW_HEIGHT + self.rng.integers(10,51,count) - self.tables.obstacle_height)
+
+		self.obstacle_x[envs,slot] = x
+		self.obstacle_rect_x[envs,slot] = x
+		self.obstacle_y[envs,slot] = y
+		self.obstacle_kind[envs,slot] = variant * 2 + flip
+		self.obstacle_active[envs,slot] = True
+
+	def plane_shapes(self):
+		angle = -self.velocity * 0.06
+		bucket = np.clip(np.round((angle - ROTATION_MIN_ANGLE) / ROTATION_STEP),0,self.tables.buckets - 1).astype(np.int64)
+		return self.frame_index.astype(np.int64) * self.tables.buckets + bucket
+
+	def obstacle_hits(self,shape):
+		tables = self.tables
+		width = tables.plane_widths[shape]
+		height = tables.plane_heights[shape]
+
+		# broad phase: bounding boxes
+		dx = self.obstacle_rect_x - self.plane_x
+		dy = self.obstacle_y - self.plane_rect_y[:,None]
+		near = self.obstacle_active & (dx < width[:,None]) & (dx + tables.obstacle_width > 0) & (dy < height[:,None]) & (dy + tables.obstacle_height > 0)
+		env, slot = np.nonzero(near)
+		hits = np.zeros(self.num_envs,dtype = bool)
+		if len(env) == 0:
+			return hits
+
+		# narrow phase: plane row r against the obstacle's solid run in the same screen row
+		rows = np.arange(tables.plane_height)
+		obstacle_row = rows[None,:] - dy[env,slot][:,None]
+		valid = (obstacle_row >= 0) & (obstacle_row < tables.obstacle_height)
+		obstacle_row = np.clip(obstacle_row,0,tables.obstacle_height - 1)
+		kind = self.obstacle_kind[env,slot][:,None]
+		left = np.clip(tables.obstacle_left[kind,obstacle_row] + dx[env,slot][:,None],0,tables.plane_width)
+		right = np.clip(tables.obstacle_right[kind,obstacle_row] + dx[env,slot][:,None],0,tables.plane_width)
+		plane_shape = shape[env][:,None]
+		solid = tables.prefix[plane_shape,rows[None,:],right] - tables.prefix[plane_shape,rows[None,:],left]
+		np.logical_or.at(hits,env,((solid > 0) & valid).any(axis = 1))
+		return hits
+
+	def ground_hits(self,shape):
+		tables = self.tables
+		# broad phase: only planes that reach down to the highest ground pixel
+		lowest = self.plane_rect_y + tables.plane_heights[shape]
+		env = np.nonzero(lowest > self.ground_y + tables.ground_top.min())[0]
+		hits = np.zeros(self.num_envs,dtype = bool)
+		if len(env) == 0:
+			return hits
+
+		columns = np.arange(tables.plane_width)
+		ground_column = self.plane_x + columns[None,:] - self.ground_rect_x[env][:,None]
+		inside = (ground_column >= 0) & (ground_column < tables.ground_width)
+		ground_top = self.ground_y + tables.ground_top[np.clip(ground_column,0,tables.ground_width - 1)]
+		plane_y = self.plane_rect_y[env][:,None]
+		bottom = plane_y + tables.plane_bottom[shape[env]]
+		top = plane_y + tables.plane_top[shape[env]]
+		hit = inside & (tables.plane_bottom[shape[env]] >= 0) & (bottom >= ground_top) & (top < self.ground_y + tables.ground_height)
+		hits[env] = hit.any(axis = 1)
+		return hits
+
+	def step(self,jumps):
+		"""Advance every game by one tick, returns (observation, reward, done)
+
+		jumps is a bool array, True where the plane jumps before this tick.
+		Games that crash are reset; episode_ticks holds their final length.
+		"""
+		dt = self.dt
+		self.velocity[jumps] = JUMP_VELOCITY
+
+		# ground
+		wrap = self.ground_rect_x + self.tables.ground_width // 2 <= 0
+		self.ground_x -= GROUND_SPEED * dt
+		self.ground_x[wrap] = 0
+		self.ground_rect_x[:] = np.round(self.ground_x)
+
+		# plane
+		self.velocity += GRAVITY * dt
+		self.plane_y += self.velocity * dt
+		self.plane_rect_y[:] = np.round(self.plane_y)
+		self.frame_index += PLANE_ANIMATION_SPEED * dt
+		self.frame_index[self.frame_index >= self.frame_count] = 0
+
+		# obstacles
+		self.obstacle_x -= OBSTACLE_SPEED * dt
+		self.obstacle_rect_x[:] = np.round(self.obstacle_x)
+		self.obstacle_active &= self.obstacle_rect_x + self.tables.obstacle_width > -100
+
+		self.spawn_timer += dt
+		due = np.nonzero(self.spawn_timer >= OBSTACLE_SPAWN_INTERVAL)[0]
+		if len(due):
+			self.spawn_timer[due] -= OBSTACLE_SPAWN_INTERVAL
+			self.spawn(due)
+
+		# collisions
+		self.ticks += 1
+		shape = self.plane_shapes()
+		done = (self.plane_rect_y <= 0) | self.ground_hits(shape) | self.obstacle_hits(shape)
+
+		reward = np.where(done,0,self.dt).astype(np.float32)
+		crashed = np.nonzero(done)[0]
+		if len(crashed):
+			self.episode_ticks[crashed] = self.ticks[crashed]
+			self.reset_envs(crashed)
+		return self.observe(), reward, done
+
+	def observe(self):
+		"""Plane height and velocity plus the next two obstacles ahead of the plane"""
+		obs = self.observation
+		obs[:,OBS_PLANE_Y] = self.plane_y
+		obs[:,OBS_PLANE_VELOCITY] = self.velocity
+
+		# obstacles not yet passed, nearest first (inactive ones sort last)
+		ahead = self.obstacle_active & (self.obstacle_rect_x + self.tables.obstacle_width > self.plane_x)
+		dx = np.where(ahead,self.obstacle_rect_x - self.plane_x,np.iinfo(np.int64).max)
+		order = np.argsort(dx,axis = 1)
+		for rank, (dx_column, y_column, flip_column) in enumerate(((OBS_NEXT_DX,OBS_NEXT_Y,OBS_NEXT_FLIP),(OBS_AFTER_DX,OBS_AFTER_Y,OBS_AFTER_FLIP))):
+			slot = order[:,rank]
+			present = ahead[self.all_envs,slot]
+			obs[:,dx_column] = np.where(present,dx[self.all_envs,slot],WINDOW_WIDTH)
+			obs[:,y_column] = np.where(present,self.obstacle_y[self.all_envs,slot],0)
+			obs[:,flip_column] = np.where(present,self.obstacle_kind[self.all_envs,slot] & 1,0)
+		return obs
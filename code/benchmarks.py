@@ -0,0 +1,211 @@
+"""Benchmarks of the game's hot paths, headless, compared against a stored baseline.
+
+Each benchmark times one operation of a fully loaded game (SDL's dummy
+video and audio drivers, no window) and reports the best ns/op over a few
+runs; the frame benchmark plays scripted frames (autopilot jumps, right
+answers) through Game.frame and also reports frames per second.
+
+With --save the results become the baseline (BENCH_BASELINE). Otherwise a
+benchmark more than --threshold slower than its baseline fails the run, so
+record the baseline on the kiosk hardware and check there before a release.
+
+Usage: python benchmarks.py [--save] [--threshold 0.2] [--baseline benchmarks.json] [name ...]
+"""
+import os, tempfile
+
+# before pygame initialises anything
+os.environ.setdefault('SDL_VIDEODRIVER','dummy')
+os.environ.setdefault('SDL_AUDIODRIVER','dummy')
+# before settings reads them: no replays, telemetry, leaderboard posts or overlay in the measurements
+for name in ('FLAPPY_REPLAY_DIR','FLAPPY_TELEMETRY_DIR','FLAPPY_LEADERBOARD_URL','FLAPPY_PROFILE'):
+	os.environ.pop(name,None)
+# nor saved quiz progress: a benchmark neither reads the player's nor overwrites it
+STATE_DIR = tempfile.TemporaryDirectory(prefix = 'flappy_bench_')
+os.environ['FLAPPY_QUESTION_STATE'] = os.path.join(STATE_DIR.name,'questions.json')
+os.environ['FLAPPY_QUESTION_STATS'] = os.path.join(STATE_DIR.name,'quiz_stats.json')
+
+import argparse, gc, json, random, sys, time
+import pygame
+from settings import *
+from assets import asset_path
+from game import Game
+from tournament import autopilot
+
+# each run lasts about this long (seconds), the best of BENCH_REPEAT runs counts
+BENCH_RUN_TIME = 0.2
+BENCH_REPEAT = 5
+BENCH_BASELINE = 'benchmarks.json'
+
+def time_op(op,number):
+	start = time.perf_counter_ns()
+	for _ in range(number):
+		op()
+	return time.perf_counter_ns() - start
+
+def measure(op,run_time = BENCH_RUN_TIME,repeat = BENCH_REPEAT):
+	"""Best ns per call over repeat runs of about run_time seconds each"""
+	gc.collect()
+	gc.disable()
+	try:
+		# calibrate the number of calls per run
+		number = 1
+		while (elapsed := time_op(op,number)) < run_time * 1e8:
+			number *= 10
+		number = max(int(number * run_time * 1e9 / elapsed),1)
+		return min(time_op(op,number) for _ in range(repeat)) / number
+	finally:
+		gc.enable()
+
+def loaded_game():
+	game = Game()
+	for _ in game.loading():
+		pass
+	game.sim.start()
+	return game
+
+def flying(game,seed = 0):
+	"""A few seconds into a run, with obstacles on screen"""
+	sim = game.sim
+	rng = random.Random(seed)
+	while sim.ticks < 3 * sim.tick_rate or not any(body.active for body in sim.obstacles):
+		if not sim.active:
+			sim.respawn()
+		if autopilot(sim,rng):
+			sim.jump()
+		sim.step()
+	return game
+
+# benchmarks: setup(game) -> operation
+def plane_rotate(game):
+	plane = game.view.plane
+	body = game.sim.plane
+	# every animation frame at every rotation the plane can show (angle = -velocity * 0.06)
+	poses = [(frame,-(ROTATION_MIN_ANGLE + (ROTATION_MAX_ANGLE - ROTATION_MIN_ANGLE) * i / 96) / 0.06)
+		for frame in range(body.frame_count) for i in range(97)]
+	state = {'i': 0}
+	def op():
+		state['i'] += 1
+		body.frame_index, body.velocity = poses[state['i'] % len(poses)]
+		plane.rotate()
+	return op
+
+def obstacle_spawn(game):
+	sim = game.sim
+	body = sim.obstacles[0]
+	return lambda: body.spawn(sim.rng,sim.hitboxes)
+
+def collisions(game):
+	return flying(game).sim.collision_cause
+
+def sim_step(game):
+	sim = flying(game).sim
+	rng = random.Random(1)
+	def op():
+		if not sim.active:
+			sim.respawn()
+		if autopilot(sim,rng):
+			sim.jump()
+		sim.step()
+	return op
+
+def sprites_update_draw(game):
+	flying(game)
+	surface = game.display_surface
+	return lambda: game.view.draw(surface,0.5)
+
+def quiz_display(game):
+	sim = game.sim
+	while sim.active:
+		sim.step()
+	# layout cached after the first call, the steady cost of a quiz frame
+	game.display_quiz()
+	return game.display_quiz
+
+def quiz_layout(game):
+	questions = game.sim.questions
+	state = {'i': 0}
+	def op():
+		# uncached: word wrap and render every line of a question
+		state['i'] += 1
+		game.quiz_layout(questions[state['i'] % len(questions)])
+	return op
+
+def frame(game):
+	"""One full frame under scripted play: input events, fixed steps, drawing, present"""
+	sim = game.sim
+	rng = random.Random(2)
+	frame_time = 1 / FRAMERATE
+	def op():
+		if sim.active:
+			if autopilot(sim,rng):
+				pygame.event.post(pygame.event.Event(pygame.KEYDOWN,key = pygame.K_SPACE))
+		elif sim.quiz_mode:
+			correct = sim.questions[game.quiz_question()]['correct']
+			pygame.event.post(pygame.event.Event(pygame.KEYDOWN,key = pygame.K_1 + correct))
+		else:
+			sim.respawn()
+		game.frame(frame_time)
+	return op
+
+BENCHMARKS = {
+	'plane.rotate': plane_rotate,
+	'obstacle.spawn': obstacle_spawn,
+	'sim.collisions': collisions,
+	'sim.step': sim_step,
+	'sprites.update_draw': sprites_update_draw,
+	'quiz.display': quiz_display,
+	'quiz.layout': quiz_layout,
+	'frame': frame}
+
+def load_baseline(path):
+	try:
+		with open(path) as file:
+			return json.load(file)['ns_per_op']
+	except (OSError,ValueError,KeyError):
+		return {}
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(description = 'Benchmark the game headless and compare against a baseline.')
+	parser.add_argument('names',nargs = '*',help = f'benchmarks to run (default all: {", ".join(BENCHMARKS)})')
+	parser.add_argument('--save',action = 'store_true',help = 'store the results as the new baseline')
+	parser.add_argument('--threshold',type = float,default = 0.2,help = 'fail when this much slower than the baseline')
+	parser.add_argument('--baseline',default = asset_path(BENCH_BASELINE))
+	args = parser.parse_args(argv)
+
+	unknown = [name for name in args.names if name not in BENCHMARKS]
+	if unknown:
+		parser.error(f'unknown benchmark {", ".join(unknown)}')
+	baseline = load_baseline(args.baseline)
+
+	results = {}
+	failed = []
+	print(f'⏱️  {"benchmark":<22} {"ns/op":>12} {"ops/s":>10} {"baseline":>12} {"change":>8}')
+	for name in args.names or BENCHMARKS:
+		game = loaded_game()
+		ns = measure(BENCHMARKS[name](game))
+		results[name] = round(ns,1)
+		line = f'   {name:<22} {ns:12,.0f} {1e9 / ns:10,.0f}'
+		if name in baseline:
+			change = ns / baseline[name] - 1
+			line += f' {baseline[name]:12,.0f} {change:+8.1%}'
+			if change > args.threshold:
+				line += '  ❌'
+				failed.append(name)
+		print(line)
+	if 'frame' in results:
+		print(f'   {1e9 / results["frame"]:.0f} frames/s under scripted play ({FRAMERATE} needed)')
+
+	if args.save:
+		with open(args.baseline,'w') as file:
+			json.dump({'ns_per_op': dict(baseline,**results)},file,indent = 1,sort_keys = True)
+		print(f'💾 baseline saved to {args.baseline}')
+		return 0
+	if failed:
+		print(f'❌ {len(failed)} benchmark(s) more than {args.threshold:.0%} slower than the baseline: {", ".join(failed)}')
+		return 1
+	if baseline:
+		print(f'✅ within {args.threshold:.0%} of the baseline')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,119 @@
+"""Collision shapes and the broad phase that keeps pixel tests to the nearby candidates.
+
+Pure Python like simulation.py. Shapes are pixel masks, a HeightField answers
+"is the plane touching the ground" from per-column heights, and a SweepList
+keeps the live obstacles ordered by x so only the ones overlapping the plane
+horizontally reach Shape.overlap.
+"""
+
+class Shape:
+	"""Collision mask stored as one integer bitset per row, bit x is column x"""
+	def __init__(self,width,height,rows):
+		self.width = width
+		self.height = height
+		self.rows = rows
+		self._columns = None
+
+	def overlap(self,other,dx,dy):
+		"""True if other, placed at (dx,dy) relative to self, shares a solid pixel"""
+		if dx >= self.width or dy >= self.height or dx + other.width <= 0 or dy + other.height <= 0:
+			return False
+		rows = self.rows
+		other_rows = other.rows
+		top = max(0,dy)
+		bottom = min(self.height,dy + other.height)
+		if dx >= 0:
+			for y in range(top,bottom):
+				if (rows[y] >> dx) & other_rows[y - dy]:
+					return True
+		else:
+			shift = -dx
+			for y in range(top,bottom):
+				if (rows[y] << shift) & other_rows[y - dy]:
+					return True
+		return False
+
+	def columns(self):
+		"""(tops,bottoms,lowest): first and last solid row per column (-1 when empty), lowest solid row overall"""
+		if self._columns is None:
+			tops = self.first_rows(range(self.height))
+			bottoms = self.first_rows(range(self.height - 1,-1,-1))
+			self._columns = (tops,bottoms,max(bottoms,default = -1))
+		return self._columns
+
+	def first_rows(self,order):
+		"""Per column, the first solid row met walking the rows in order (-1 when empty)"""
+		found = [-1] * self.width
+		seen = 0
+		for y in order:
+			# only the columns hit for the first time, each column is visited once
+			new = self.rows[y] & ~seen
+			seen |= new
+			while new:
+				bit = new & -new
+				found[bit.bit_length() - 1] = y
+				new ^= bit
+		return found
+
+class HeightField:
+	"""A shape that is solid from its top pixel down in every column (the ground)"""
+	def __init__(self,shape):
+		self.shape = shape
+		tops = shape.columns()[0]
+		self.width = shape.width
+		self.height = shape.height
+		self.tops = [top if top >= 0 else shape.height for top in tops]
+		self.highest = min(self.tops,default = shape.height)
+
+	def hits(self,shape,dx,dy):
+		"""True if shape, placed at (dx,dy) relative to the field, touches it"""
+		# broad phase: most of the time the plane is nowhere near the highest ground pixel
+		if dy + shape.height <= self.highest or dy >= self.height:
+			return False
+		tops, bottoms, lowest = shape.columns()
+		if dy + lowest < self.highest:
+			return False
+
+		# per column: the plane's lowest pixel at or below the ground's top
+		field_tops = self.tops
+		for x in range(max(0,-dx),min(shape.width,self.width - dx)):
+			bottom = bottoms[x]
+			if bottom >= 0 and dy + bottom >= field_tops[x + dx] and dy + tops[x] < self.height:
+				return True
+		return False
+
+class SweepList:
+	"""Live obstacles sorted by x
+
+	Every obstacle moves at the same speed, so the order only changes when one
+	is added or retires off the left edge.
+	"""
+	def __init__(self):
+		self.bodies = []
+
+	def add(self,body):
+		bodies = self.bodies
+		if body in bodies:
+			bodies.remove(body)
+		# new obstacles spawn on the right, search from the end
+		index = len(bodies)
+		while index and bodies[index - 1].rect_x > body.rect_x:
+			index -= 1
+		bodies.insert(index,body)
+
+	def prune(self):
+		"""Drop obstacles that went inactive, always the leftmost ones"""
+		bodies = self.bodies
+		while bodies and not bodies[0].active:
+			del bodies[0]
+
+	def clear(self):
+		self.bodies.clear()
+
+	def overlapping(self,left,right):
+		"""Obstacles whose horizontal extent meets [left,right)"""
+		for body in self.bodies:
+			if body.rect_x >= right:
+				break
+			if body.rect_x + body.shape.width > left:
+				yield body
@@ -0,0 +1,118 @@
+"""Adaptive quiz difficulty: per-question statistics and the question picker.
+
+QuestionStats keeps running counts per question (times asked, answered
+correctly, total response time), so a difficulty estimate is a few
+arithmetic operations and an answer is one update, never a rescan. Only
+questions that were asked have an entry, keyed by questions.question_id:
+the statistics follow a question when the bank is edited around it.
+
+QuestionPicker holds a small hand of questions dealt by the QuestionDeck,
+sorted by difficulty, and asks the one closest to the player's level: a
+bisect over the hand, the same cost whatever the size of the bank, and the
+deck still deals every question once before any repeats. The level moves
+up after a correct answer and down after a wrong one.
+
+Both are saved together in QUESTION_STATS between sessions.
+"""
+import bisect, json, os
+from settings import *
+from questions import question_id
+
+# an unseen question counts as this many answers, half of them right
+PRIOR_ANSWERS = 2
+# answers slower than this (seconds) count as fully slow
+SLOW_ANSWER = 10
+# share of the difficulty coming from wrong answers, the rest from response time
+MISS_WEIGHT = 0.8
+HAND_SIZE = 16
+# saved statistics of other versions are dropped (1 keyed them by bank position)
+STATS_VERSION = 2
+LEVEL_UP = 0.05
+LEVEL_DOWN = 0.1
+
+class QuestionStats:
+	def __init__(self,entries = None):
+		# {question id: [asked, correct, total response time]}
+		self.entries = entries if entries is not None else {}
+
+	def record(self,question,correct,latency):
+		entry = self.entries.setdefault(question,[0,0,0.0])
+		entry[0] += 1
+		entry[1] += bool(correct)
+		entry[2] += latency
+
+	def answer_rate(self,question):
+		asked, correct, _ = self.entries.get(question,(0,0,0))
+		return correct / asked if asked else None
+
+	def mean_latency(self,question):
+		asked, _, latency = self.entries.get(question,(0,0,0))
+		return latency / asked if asked else None
+
+	def difficulty(self,question):
+		"""0 (everyone answers it right away) to 1 (nobody gets it right)"""
+		asked, correct, latency = self.entries.get(question,(0,0,0))
+		misses = (asked - correct + PRIOR_ANSWERS / 2) / (asked + PRIOR_ANSWERS)
+		slowness = min(latency / asked / SLOW_ANSWER,1) if asked else 0.5
+		return MISS_WEIGHT * misses + (1 - MISS_WEIGHT) * slowness
+
+class QuestionPicker:
+	def __init__(self,deck,stats,questions,level = 0.5,hand = ()):
+		self.deck = deck
+		self.stats = stats
+		self.questions = questions
+		self.level = level
+		# [(difficulty,position)] sorted, dealt by the deck but not asked yet
+		self.hand = sorted((self.difficulty(question),question) for question in hand)
+
+	def difficulty(self,question):
+		return self.stats.difficulty(question_id(self.questions[question]))
+
+	def pick(self):
+		"""Position of the question to ask next"""
+		while len(self.hand) < min(HAND_SIZE,self.deck.size):
+			question = self.deck.draw()
+			# the deck's next round can deal a question still in the hand
+			if any(question == held for _, held in self.hand):
+				continue
+			bisect.insort(self.hand,(self.difficulty(question),question))
+		i = bisect.bisect_left(self.hand,(self.level,))
+		# the closer of the neighbours around the player's level
+		if i == len(self.hand) or (i > 0 and self.level - self.hand[i - 1][0] <= self.hand[i][0] - self.level):
+			i -= 1
+		return self.hand.pop(i)[1]
+
+	def answered(self,question,correct,latency):
+		self.stats.record(question_id(self.questions[question]),correct,latency)
+		if correct:
+			self.level = min(self.level + LEVEL_UP,1)
+		else:
+			self.level = max(self.level - LEVEL_DOWN,0)
+
+	def state(self):
+		return {
+			'version': STATS_VERSION,
+			'level': self.level,
+			'hand': [question for _, question in self.hand],
+			'stats': self.stats.entries}
+
+	def save(self,path):
+		with open(path + '.tmp','w') as file:
+			json.dump(self.state(),file,separators = (',',':'))
+		os.replace(path + '.tmp',path)
+
+	@classmethod
+	def load(cls,path,deck,questions):
+		"""The picker saved by the last session, a fresh one if there is none
+
+		The statistics survive edits to the bank (see question_id), the hand
+		is kept only when it still fits the bank.
+		"""
+		try:
+			with open(path) as file:
+				state = json.load(file)
+			stats = QuestionStats(dict(state['stats']) if state.get('version') == STATS_VERSION else {})
+			hand = [question for question in state['hand'] if 0 <= question < deck.size]
+			return cls(deck,stats,questions,state['level'],hand)
+		except (OSError,ValueError,KeyError,TypeError,AttributeError):
+			return cls(deck,QuestionStats(),questions)
@@ -0,0 +1,466 @@
+"""The game itself, shared by the desktop and web builds.
+
+Game sets up the window, loads the rest over the first frames (loading) and
+plays one frame at a time (frame). The loop that drives it lives in
+runners.py: a blocking one for desktop and an asyncio one for pygbag.
+"""
+from startup import StartupTimer
+import time
+import pygame
+from settings import *
+from assets import load_image, load_font
+from hitboxes import load_hitboxes
+from questions import QuestionBank, QuestionDeck
+from difficulty import QuestionPicker
+from simulation import Simulation
+from replay import ReplayRecorder, save_session
+from view import WorldView
+from sprites import rotation_cache
+from renderer import Renderer
+from profiler import FrameProfiler
+from text import TextCache, DigitAtlas
+from music import Music
+from remote import PackDownload
+from leaderboard_client import LeaderboardClient
+from telemetry import Telemetry
+
+class Game:
+	def __init__(self,caption = 'Botz - Drone'):
+		
+		# setup: only what the start screen needs, load_stages does the rest
+		self.startup = StartupTimer()
+		pygame.display.init()
+		pygame.font.init()
+		self.display_surface = pygame.display.set_mode((WINDOW_WIDTH,WINDOW_HEIGHT))
+		pygame.display.set_caption(caption)
+		self.clock = pygame.time.Clock()
+		self.renderer = Renderer(self.display_surface)
+		self.accumulator = 0
+		self.running = True
+		# hidden or unfocused window, the world waits instead of catching up afterwards
+		self.suspended = False
+
+		# frame time per phase of the loop, see profiler.py
+		self.profiler = FrameProfiler(('wait','events','update','collisions','draw','score','overlay','present'))
+		self.recorder = None
+
+		# text
+		self.font = load_font('graphics/font/BD_Cartoon_Shout.ttf', 30)
+		self.small_font = load_font('graphics/font/BD_Cartoon_Shout.ttf', 20)
+		self.text = TextCache()
+		# quiz screen blits of the question on screen, (bank position,blits)
+		self.quiz_blits = (None,[])
+
+		# start screen
+		self.start_button_rect = pygame.Rect(WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT // 2 - 25, 200, 50)
+		self.restart_button_rect = pygame.Rect(WINDOW_WIDTH // 2 - 100, WINDOW_HEIGHT // 2 + 50, 200, 50)
+		self.button_font = load_font('graphics/font/BD_Cartoon_Shout.ttf', 24)
+
+		# music, streamed once the first frame is on screen
+		self.music = Music()
+
+		# gameplay events, written in the background
+		self.telemetry = Telemetry()
+
+		# final scores, posted in the background
+		self.leaderboard = LeaderboardClient()
+
+		# web boot bundle: the gameplay assets still have to be fetched, the runner starts it
+		self.download = PackDownload.from_manifest()
+		# the runner's task fetching it, and the download status the start screen shows
+		self.download_task = None
+		self.start_status = None
+
+	def load_stages(self):
+		"""Load what the start screen does not need, one stage per frame
+
+		Yields the name of each finished stage, None while waiting for the download.
+		"""
+		if self.download:
+			yield from self.download.wait()
+			yield 'download'
+
+		# audio device, slow to open on some systems
+		try:
+			pygame.mixer.init()
+		except pygame.error:
+			pass
+		yield 'audio'
+
+		# simulation + the sprites that draw it
+		hitboxes = load_hitboxes()
+		self.scale_factor = hitboxes.scale_factor
+		# the deck carries on where the last session stopped, no question repeats until all were asked
+		questions = QuestionBank.open()
+		self.sim = Simulation(hitboxes,questions,deck = QuestionDeck.load(QUESTION_STATE,len(questions)))
+		# chooses each quiz question for the player's level from what the deck deals
+		self.picker = QuestionPicker.load(QUESTION_STATS,self.sim.deck,self.sim.questions)
+		self.quiz_started = 0
+		self.profiler.track(self.sim,'collisions')
+		self.recorder = ReplayRecorder(self.sim) if REPLAY_DIR else None
+		self.sim.telemetry = self.telemetry
+		yield 'simulation'
+
+		# the plane's rotations are the slowest images to make, they get a frame of their own
+		rotation_cache(self.scale_factor / 1.7)
+		yield 'plane'
+
+		self.view = WorldView(self.sim,self.scale_factor)
+		yield 'sprites'
+
+		# hud
+		self.score_digits = DigitAtlas(self.font,'black')
+		self.menu_surf = load_image('graphics/ui/menu.png')
+		self.menu_rect = self.menu_surf.get_rect(midbottom = (WINDOW_WIDTH / 2, WINDOW_HEIGHT - 20))
+		yield 'hud'
+
+		self.music.start()
+		yield 'music'
+
+	def present_start_screen(self):
+		# input stays queued until the game loop can handle it
+		pygame.event.pump()
+		self.draw_start_screen()
+		self.renderer.present()
+		self.startup.frame_presented()
+
+	def draw_start_screen(self):
+		# the status line is part of the key, the screen is redrawn when it changes
+		self.start_status = self.download.status() if self.download else None
+		self.renderer.draw_static(('start',self.start_status),self.display_start_screen)
+
+	def loaded(self):
+		self.startup.loaded()
+		if STARTUP_EXIT:
+			pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+	def loading(self):
+		"""Show the start screen right away and load the rest behind it, yields after every frame
+
+		Closing the window while the gameplay pack downloads ends it early, running is then False.
+		"""
+		self.present_start_screen()
+		yield
+		for stage in self.load_stages():
+			if stage is None:
+				# waiting for the download, which may never come: the window still closes
+				if pygame.event.get(pygame.QUIT):
+					self.quit_loading()
+					return
+				# the screen only changes when the download failed and is retried
+				if self.download.status() != self.start_status:
+					self.draw_start_screen()
+					self.renderer.present()
+				yield
+				continue
+			self.startup.stage(stage)
+			self.present_start_screen()
+			yield
+		self.loaded()
+
+	def quit_loading(self):
+		"""Closed before the game finished loading, nothing was played yet"""
+		if self.download_task:
+			self.download_task.cancel()
+		self.leaderboard.close()
+		self.telemetry.close()
+		self.running = False
+
+	def display_start_screen(self):
+		# Dark green background
+		self.display_surface.fill((34, 139, 34))  # Dark green color
+		
+		# Title
+		title_text = self.text.render(self.font, "BOTZ - FLAPPY DRONE", 'white')
+		title_rect = title_text.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT // 2 - 100))
+		self.display_surface.blit(title_text, title_rect)
+		
+		# Subtitle
+		subtitle_text = self.text.render(self.small_font, "Archaeology Quiz Edition", 'white')
+		subtitle_rect = subtitle_text.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT // 2 - 60))
+		self.display_surface.blit(subtitle_text, subtitle_rect)
+		
+		# Start button background (darker green)
+		pygame.draw.rect(self.display_surface, (0, 100, 0), self.start_button_rect)
+		pygame.draw.rect(self.display_surface, 'white', self.start_button_rect, 3)  # White border
+		
+		# Start button text
+		button_text = self.text.render(self.button_font, "START GAME", 'white')
+		button_text_rect = button_text.get_rect(center=self.start_button_rect.center)
+		self.display_surface.blit(button_text, button_text_rect)
+
+		# the gameplay assets have not arrived yet (web build)
+		if self.start_status:
+			status_text = self.text.render(self.small_font, self.start_status, 'white')
+			status_rect = status_text.get_rect(center=(WINDOW_WIDTH / 2, self.start_button_rect.bottom + 40))
+			self.display_surface.blit(status_text, status_rect)
+
+	def display_score(self):
+		# Display "TechtonicBotz" at the top
+		company_text = self.text.render(self.small_font, "TechtonicBotz", 'brown')
+		company_rect = company_text.get_rect(center=(WINDOW_WIDTH / 2, 20))
+		self.display_surface.blit(company_text, company_rect)
+		
+		if self.sim.active:
+			# the ticking score is composed from cached digits
+			self.score_digits.blit(self.display_surface, self.sim.score, midtop = (WINDOW_WIDTH / 2, WINDOW_HEIGHT / 10))
+			return
+		if self.sim.quiz_mode:
+			self.display_quiz()
+			return
+		y = WINDOW_HEIGHT / 2 - 50
+		score_text = f"Your Score: {self.sim.score}"
+		
+		# Display restart button
+		pygame.draw.rect(self.display_surface, (139, 69, 19), self.restart_button_rect)  # Saddle brown
+		pygame.draw.rect(self.display_surface, 'white', self.restart_button_rect, 3)  # White border
+		
+		# Restart button text
+		restart_text = self.text.render(self.button_font, "RESTART!", 'white')
+		restart_text_rect = restart_text.get_rect(center=self.restart_button_rect.center)
+		self.display_surface.blit(restart_text, restart_text_rect)
+
+		score_surf = self.text.render(self.font,score_text,'black')
+		score_rect = score_surf.get_rect(midtop = (WINDOW_WIDTH / 2,y))
+		self.display_surface.blit(score_surf,score_rect)
+
+		# arrives a moment after game over, the paused screen key redraws it
+		if self.leaderboard.last_rank:
+			rank_surf = self.text.render(self.small_font,f"Rank #{self.leaderboard.last_rank}",'black')
+			self.display_surface.blit(rank_surf,rank_surf.get_rect(midtop = score_rect.midbottom))
+		
+	def wrap_text(self, text, font, max_width):
+		"""Wrap text to fit within max_width pixels"""
+		words = text.split(' ')
+		lines = []
+		current_line = []
+		
+		for word in words:
+			# Test if adding this word would exceed max width
+			test_line = ' '.join(current_line + [word])
+			test_width = font.size(test_line)[0]
+			
+			if test_width <= max_width:
+				current_line.append(word)
+			else:
+				# If current_line is empty, the word itself is too long
+				if current_line:
+					lines.append(' '.join(current_line))
+					current_line = [word]
+				else:
+					lines.append(word)  # Add the long word anyway
+					current_line = []
+		
+		# Add any remaining words
+		if current_line:
+			lines.append(' '.join(current_line))
+		
+		return lines
+	
+	def display_quiz(self):
+		# Display current total score (frozen during quiz)
+		total_score = self.sim.accumulated_score + self.sim.current_session_score
+		score_text = f"Total Score: {total_score}"
+		score_surf = self.text.render(self.font, score_text, 'blue')
+		score_rect = score_surf.get_rect(center=(WINDOW_WIDTH / 2, 50))
+		self.display_surface.blit(score_surf, score_rect)
+		
+		question = self.quiz_question()
+		# only the current question is kept, a big bank would otherwise pile up layouts all session
+		if self.quiz_blits[0] != question:
+			self.quiz_blits = (question, self.quiz_layout(self.sim.questions[question]))
+		self.display_surface.blits(self.quiz_blits[1], False)
+
+	def quiz_layout(self, question_data):
+		"""Render and place the question, answers and instructions once"""
+		blits = []
+		
+		# Display question with word wrapping
+		question_text = question_data["question"]
+		
+		# Wrap the question text to fit within 80% of window width
+		max_question_width = int(WINDOW_WIDTH * 0.8)
+		question_lines = self.wrap_text(question_text, self.small_font, max_question_width)
+		
+		# Display each line of the wrapped question
+		start_y = 130
+		line_spacing = 25
+		for i, line in enumerate(question_lines):
+			question_surf = self.small_font.render(line, True, 'brown')
+			question_rect = question_surf.get_rect(center=(WINDOW_WIDTH / 2, start_y + i * line_spacing))
+			blits.append((question_surf, question_rect))
+		
+		# Display answer options
+		# Adjust answer position based on number of question lines
+		answer_start_y = start_y + len(question_lines) * line_spacing + 20
+		for i, answer in enumerate(question_data["answers"]):
+			color = 'brown' if i == question_data["correct"] else 'brown'
+			answer_text = f"{i + 1}. {answer}"
+			answer_surf = self.small_font.render(answer_text, True, color)
+			answer_rect = answer_surf.get_rect(center=(WINDOW_WIDTH / 2, answer_start_y + i * 30))
+			blits.append((answer_surf, answer_rect))
+		
+		# Display instructions
+		instruction_y = answer_start_y + 3 * 30 + 20
+		instruction_surf = self.small_font.render("Press 1, 2, or 3 to answer!", True, 'blue')
+		instruction_rect = instruction_surf.get_rect(center=(WINDOW_WIDTH / 2, instruction_y))
+		blits.append((instruction_surf, instruction_rect))
+		return blits
+		
+	def quiz_question(self):
+		"""Position of the question asked in this quiz, the picker chooses it when the quiz starts"""
+		if self.sim.question is None:
+			self.sim.ask(self.picker.pick())
+			self.quiz_started = time.perf_counter()
+		return self.sim.question
+
+	def handle_quiz_answer(self, answer_index):
+		question = self.quiz_question()
+		correct = self.sim.answer(answer_index)
+		latency = time.perf_counter() - self.quiz_started
+		self.picker.answered(question,correct,latency)
+		self.telemetry.answer(question,correct,latency)
+		if not correct:
+			# game over, the score is final
+			self.leaderboard.last_rank = None
+			self.leaderboard.submit(self.sim.score)
+
+	def update(self):
+		"""Advance the world by one fixed simulation step"""
+		self.sim.step()
+
+	def draw(self,alpha):
+		self.view.draw(self.display_surface,alpha)
+
+	def paused_screen_key(self):
+		if self.sim.quiz_mode:
+			return ('quiz',self.quiz_question(),self.sim.accumulated_score + self.sim.current_session_score)
+		return ('game over',self.sim.score,self.leaderboard.last_rank)
+
+	def display_paused_screen(self):
+		self.view.draw(self.display_surface,1)
+		self.display_score()
+		if not self.sim.quiz_mode:
+			self.display_surface.blit(self.menu_surf,self.menu_rect)
+
+	def save_replay(self):
+		if self.recorder:
+			save_session(self.recorder)
+
+	def save_questions(self):
+		try:
+			self.sim.deck.save(QUESTION_STATE)
+			self.picker.save(QUESTION_STATS)
+		except OSError:
+			pass
+
+	def save_profile(self):
+		if PROFILE_DUMP:
+			self.profiler.dump(PROFILE_DUMP)
+
+	def restart_game(self):
+		"""Reset the game to initial state"""
+		self.sim.restart()
+
+	def frame(self,frame_time):
+		"""Handle input, advance and draw one frame; returns False when nothing had to be presented
+
+		frame_time is the time since the previous frame in seconds, it feeds
+		the fixed-step accumulator. Frames that start or end suspended add no
+		time, nor does a gap longer than SUSPEND_GAP.
+		"""
+		was_suspended = self.suspended
+
+		# event loop
+		for event in pygame.event.get():
+			if event.type == pygame.QUIT:
+				self.save_replay()
+				self.save_questions()
+				self.save_profile()
+				self.leaderboard.close()
+				self.telemetry.close()
+				self.running = False
+			if event.type in (pygame.WINDOWHIDDEN,pygame.WINDOWMINIMIZED,pygame.WINDOWFOCUSLOST):
+				self.suspended = True
+			if event.type in (pygame.WINDOWSHOWN,pygame.WINDOWRESTORED,pygame.WINDOWFOCUSGAINED):
+				self.suspended = False
+			if event.type in (pygame.VIDEOEXPOSE,pygame.WINDOWEXPOSED):
+				self.renderer.invalidate()
+			if event.type == pygame.KEYDOWN:
+				if event.key == pygame.K_F3:
+					self.profiler.toggle()
+					self.renderer.invalidate()
+				if self.sim.quiz_mode:
+					if event.key == pygame.K_1:
+						self.handle_quiz_answer(0)
+					elif event.key == pygame.K_2:
+						self.handle_quiz_answer(1)
+					elif event.key == pygame.K_3:
+						self.handle_quiz_answer(2)
+				elif event.key == pygame.K_SPACE:
+					if not self.sim.started:
+						pass
+					elif self.sim.active:
+						self.view.jump()
+					elif not self.sim.quiz_mode:
+						self.sim.respawn()
+			if event.type == pygame.MOUSEBUTTONDOWN:
+				if not self.sim.started:
+					# Check if start button was clicked
+					if self.start_button_rect.collidepoint(event.pos):
+						self.sim.start()
+				elif self.sim.active:
+					self.view.jump()
+				elif not self.sim.quiz_mode:
+					# Check if restart button was clicked
+					if self.restart_button_rect.collidepoint(event.pos):
+						self.restart_game()
+					else:
+						self.sim.respawn()
+		self.profiler.lap('events')
+
+		if not (was_suspended or self.suspended) and frame_time <= SUSPEND_GAP:
+			self.accumulator += min(frame_time,MAX_FRAME_TIME)
+
+		# game logic
+		if not self.sim.started:
+			self.accumulator = 0
+			self.draw_start_screen()
+			self.profiler.lap('draw')
+		elif self.suspended and self.sim.active:
+			# the last frame stays on screen until the window comes back
+			self.accumulator = 0
+			return False
+		elif self.sim.active or not self.renderer.dirty:
+			steps = 0
+			while self.accumulator >= TIMESTEP and steps < MAX_STEPS_PER_FRAME:
+				self.accumulator -= TIMESTEP
+				self.update()
+				steps += 1
+			if steps == MAX_STEPS_PER_FRAME:
+				# too slow to keep up, drop the backlog rather than run longer next frame
+				self.accumulator = min(self.accumulator,TIMESTEP)
+			self.profiler.lap('update')
+
+			self.renderer.begin_frame()
+			self.draw(self.accumulator / TIMESTEP)
+			self.profiler.lap('draw')
+			self.display_score()
+
+			if not self.sim.active:
+				self.display_surface.blit(self.menu_surf,self.menu_rect)
+			self.profiler.lap('score')
+		else:
+			# quiz / game over: the world stays frozen behind the overlay
+			self.accumulator = 0
+			self.renderer.draw_static(self.paused_screen_key(),self.display_paused_screen)
+			self.profiler.lap('draw')
+
+		overlay_rect = self.profiler.draw(self.display_surface)
+		if overlay_rect:
+			self.renderer.add_rect(overlay_rect)
+		self.profiler.lap('overlay')
+
+		presented = self.renderer.present()
+		self.profiler.lap('present')
+		return presented
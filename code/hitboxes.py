@@ -0,0 +1,70 @@
+"""Collision shapes for the simulation, built from the same images the sprites draw.
+
+Only pygame's image and transform modules are used, so this works without a
+window or audio device (e.g. SDL_VIDEODRIVER=dummy on CI machines). With a
+baked atlas (see bake.py) the shapes come from its masks and no image is
+decoded at all.
+"""
+import pygame
+from settings import *
+from assets import load_image, get_atlas
+from collision import Shape, HeightField
+from sprites import rotation_cache
+
+# alpha byte -> '0' / '1', same threshold as pygame.mask.from_surface
+_ALPHA_BITS = bytes(49 if alpha > 127 else 48 for alpha in range(256))
+
+_hitboxes = None
+
+def shape_from_surface(surface):
+	width, height = surface.get_size()
+	bits = pygame.image.tobytes(surface,'RGBA')[3::4].translate(_ALPHA_BITS)
+	rows = [int(bits[y * width:(y + 1) * width][::-1],2) for y in range(height)]
+	return Shape(width,height,rows)
+
+def image_shape(path,scale_factor = 1,flip = False):
+	atlas = get_atlas()
+	shape = atlas.shape(path,scale_factor,flip) if atlas else None
+	return shape or shape_from_surface(load_image(path,scale_factor,flip))
+
+def image_size(path,scale_factor = 1,alpha = True):
+	atlas = get_atlas()
+	size = atlas.size(path,scale_factor) if atlas else None
+	return size or load_image(path,scale_factor,alpha = alpha).get_size()
+
+def world_scale_factor():
+	"""Scale that makes the background fill the window height"""
+	atlas = get_atlas()
+	if atlas:
+		return atlas.scale_factor
+	return WINDOW_HEIGHT / load_image('graphics/environment/background.png',alpha = False).get_height()
+
+class Hitboxes:
+	def __init__(self,scale_factor):
+		self.scale_factor = scale_factor
+
+		# plane: shapes[frame][rotation bucket]
+		atlas = get_atlas()
+		self.plane = atlas.rotation_shapes(scale_factor / 1.7) if atlas else None
+		if self.plane is None:
+			cache = rotation_cache(scale_factor / 1.7)
+			self.plane = [[shape_from_surface(image) for image in images] for images in cache.images]
+		self.plane_size = image_size('graphics/drone/drone0.png',scale_factor / 1.7)
+
+		# obstacles by (variant,flip)
+		self.obstacles = {}
+		for variant in (0,1):
+			for flip in (False,True):
+				self.obstacles[(variant,flip)] = image_shape(f'graphics/obstacles/{variant}.png',scale_factor * 1.1,flip)
+
+		# environment
+		self.ground = image_shape('graphics/environment/ground.png',scale_factor)
+		self.ground_field = HeightField(self.ground)
+		self.background_width = image_size('graphics/environment/background.png',scale_factor,alpha = False)[0] * 2
+
+def load_hitboxes():
+	"""Hitboxes for the current window size, built once per process"""
+	global _hitboxes
+	if _hitboxes is None:
+		_hitboxes = Hitboxes(world_scale_factor())
+	return _hitboxes
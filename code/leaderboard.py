@@ -0,0 +1,195 @@
+"""Local leaderboard service: scores in SQLite behind a small HTTP API.
+
+Endpoints (JSON):
+	POST /scores {"scores": [{"name": str, "score": int, "kiosk": str}, ...]}
+		-> {"accepted": n, "ranks": [rank of each score]}
+	GET /top?n=10 -> {"scores": [{"name", "score", "kiosk", "time"}, ...]}
+	GET /rank?score=123 -> {"rank": int, "total": int}
+
+A rank is 1 + the number of strictly higher scores. Top-N walks the score
+index from the top; ranks sum the per-score counts above a score, a table
+kept next to the scores in the same transaction, so a rank costs one range
+over distinct scores instead of a count over every submission. Kiosks post
+their scores in batches (see leaderboard_client.py), one transaction each;
+when the database stays busy for BUSY_TIMEOUT the service answers 503 and
+the kiosk keeps the batch for its next try.
+
+Usage: python leaderboard.py [--host 127.0.0.1] [--port 8765] [--db leaderboard.db]
+"""
+import argparse, json, queue, sqlite3, sys, time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAX_BATCH = 1000
+MAX_TOP = 100
+NAME_LENGTH = 32
+# seconds a request waits for the write lock, below the client's TIMEOUT: a
+# client that gave up must never see its batch stored after all, or the
+# resend stores it twice
+BUSY_TIMEOUT = 2
+
+SCHEMA = '''
+create table if not exists scores (
+	id integer primary key,
+	name text not null,
+	kiosk text not null,
+	score integer not null,
+	time real not null);
+create index if not exists scores_by_score on scores (score desc, id);
+create table if not exists score_counts (
+	score integer primary key,
+	count integer not null);
+'''
+
+class Store:
+	"""SQLite connections shared by the request threads"""
+	def __init__(self,path,connections = 8):
+		self.path = path
+		self.pool = queue.Queue()
+		for _ in range(connections):
+			# WAL: readers never wait for the writer
+			connection = sqlite3.connect(path,timeout = BUSY_TIMEOUT,check_same_thread = False,isolation_level = None)
+			connection.execute('pragma journal_mode = wal')
+			connection.execute('pragma synchronous = normal')
+			self.pool.put(connection)
+		with self.connection() as connection:
+			connection.executescript(SCHEMA)
+			# databases from before score_counts: count their scores once
+			connection.execute('insert into score_counts (score,count) select score,count(*) from scores '
+				'where not exists (select 1 from score_counts) group by score')
+
+	@contextmanager
+	def connection(self):
+		connection = self.pool.get()
+		try:
+			yield connection
+		finally:
+			self.pool.put(connection)
+
+	def add(self,scores):
+		"""Insert [(name,kiosk,score)] in one transaction, returns the rank of each score"""
+		now = time.time()
+		with self.connection() as connection:
+			connection.execute('begin immediate')
+			try:
+				connection.executemany('insert into scores (name,kiosk,score,time) values (?,?,?,?)',
+					[(name,kiosk,score,now) for name, kiosk, score in scores])
+				connection.executemany('insert into score_counts (score,count) values (?,1) '
+					'on conflict (score) do update set count = count + 1',[(score,) for _, _, score in scores])
+				ranks = [self.rank_in(connection,score) for _, _, score in scores]
+				connection.execute('commit')
+			except BaseException:
+				connection.execute('rollback')
+				raise
+		return ranks
+
+	@staticmethod
+	def rank_in(connection,score):
+		higher, = connection.execute('select coalesce(sum(count),0) from score_counts where score > ?',(score,)).fetchone()
+		return higher + 1
+
+	def rank(self,score):
+		with self.connection() as connection:
+			rank = self.rank_in(connection,score)
+			total, = connection.execute('select coalesce(sum(count),0) from score_counts').fetchone()
+		return rank, total
+
+	def top(self,n):
+		with self.connection() as connection:
+			rows = connection.execute('select name,kiosk,score,time from scores order by score desc, id limit ?',(n,)).fetchall()
+		return [{'name': name, 'kiosk': kiosk, 'score': score, 'time': when} for name, kiosk, score, when in rows]
+
+class BadRequest(Exception):
+	pass
+
+def parse_scores(body):
+	try:
+		scores = json.loads(body)['scores']
+		parsed = [(str(entry['name'])[:NAME_LENGTH],str(entry.get('kiosk',''))[:NAME_LENGTH],int(entry['score'])) for entry in scores]
+	except (ValueError,KeyError,TypeError) as error:
+		raise BadRequest(f'bad scores: {error}')
+	if len(parsed) > MAX_BATCH:
+		raise BadRequest(f'at most {MAX_BATCH} scores per request')
+	return parsed
+
+class Handler(BaseHTTPRequestHandler):
+	# keep-alive, kiosks reuse their connection between batches
+	protocol_version = 'HTTP/1.1'
+	store = None
+
+	def send_json(self,status,data):
+		body = json.dumps(data).encode()
+		self.send_response(status)
+		self.send_header('Content-Type','application/json')
+		self.send_header('Content-Length',str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def send_unavailable(self,error):
+		# e.g. database is locked: nothing was stored, the client sends the batch again later
+		self.send_json(503,{'error': f'store unavailable: {error}'})
+
+	def do_GET(self):
+		url = urlparse(self.path)
+		query = parse_qs(url.query)
+		try:
+			if url.path == '/top':
+				n = min(int(query.get('n',['10'])[0]),MAX_TOP)
+				self.send_json(200,{'scores': self.store.top(n)})
+			elif url.path == '/rank':
+				rank, total = self.store.rank(int(query['score'][0]))
+				self.send_json(200,{'rank': rank, 'total': total})
+			else:
+				self.send_json(404,{'error': 'not found'})
+		except (KeyError,ValueError) as error:
+			self.send_json(400,{'error': f'bad query: {error}'})
+		except sqlite3.Error as error:
+			self.send_unavailable(error)
+
+	def do_POST(self):
+		body = self.rfile.read(int(self.headers.get('Content-Length',0)))
+		if urlparse(self.path).path != '/scores':
+			self.send_json(404,{'error': 'not found'})
+			return
+		try:
+			scores = parse_scores(body)
+		except BadRequest as error:
+			self.send_json(400,{'error': str(error)})
+			return
+		try:
+			ranks = self.store.add(scores)
+		except sqlite3.Error as error:
+			self.send_unavailable(error)
+			return
+		self.send_json(200,{'accepted': len(scores), 'ranks': ranks})
+
+	def log_message(self,format,*args):
+		# one line per request would be most of the work under load
+		pass
+
+def serve(host,port,db):
+	Handler.store = Store(db)
+	server = ThreadingHTTPServer((host,port),Handler)
+	server.daemon_threads = True
+	return server
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(description = 'Serve the local leaderboard.')
+	parser.add_argument('--host',default = '127.0.0.1')
+	parser.add_argument('--port',type = int,default = 8765)
+	parser.add_argument('--db',default = 'leaderboard.db')
+	args = parser.parse_args(argv)
+
+	server = serve(args.host,args.port,args.db)
+	print(f'🏆 leaderboard on http://{args.host}:{args.port} ({args.db})')
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,84 @@
+"""Game side of the leaderboard (see leaderboard.py): queued, batched submissions.
+
+submit() only puts the score on a queue. A daemon thread collects whatever
+arrives within FLUSH_INTERVAL into one POST and keeps failed batches for the
+next try, so the game loop never waits on the network. The rank the service
+returns for the latest score ends up in last_rank.
+"""
+import json, platform, queue, threading, time
+import urllib.request
+from settings import *
+
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 0.5
+# scores waiting while the service is unreachable, the oldest are dropped first
+MAX_PENDING = 1000
+RETRY_DELAY = 5
+# longer than the service's BUSY_TIMEOUT, so a busy service answers 503 first
+TIMEOUT = 5
+
+class LeaderboardClient:
+	def __init__(self,url = LEADERBOARD_URL,name = PLAYER_NAME,kiosk = None):
+		# no threads in the browser build
+		self.url = None if BROWSER else url
+		self.name = name
+		self.kiosk = kiosk or platform.node()
+		self.queue = queue.Queue()
+		self.pending = []
+		self.last_rank = None
+		self.thread = None
+
+	def submit(self,score):
+		if not self.url:
+			return
+		if self.thread is None:
+			self.thread = threading.Thread(target = self.run,name = 'leaderboard',daemon = True)
+			self.thread.start()
+		self.queue.put({'name': self.name, 'kiosk': self.kiosk, 'score': score})
+
+	def close(self,timeout = 1):
+		"""Flush what is queued, waiting at most timeout seconds"""
+		if self.thread:
+			self.queue.put(None)
+			self.thread.join(timeout)
+
+	def collect(self,wait):
+		"""Move queued scores to pending, returns False once close() was called"""
+		deadline = time.monotonic() + wait
+		while len(self.pending) < BATCH_SIZE:
+			try:
+				entry = self.queue.get(timeout = max(deadline - time.monotonic(),0))
+			except queue.Empty:
+				return True
+			if entry is None:
+				return False
+			self.pending.append(entry)
+		return True
+
+	def run(self):
+		running = True
+		while running:
+			# block until there is something to send, then give the rest of the batch a moment
+			if not self.pending:
+				entry = self.queue.get()
+				if entry is None:
+					break
+				self.pending.append(entry)
+			running = self.collect(FLUSH_INTERVAL)
+			del self.pending[:-MAX_PENDING]
+			while self.pending:
+				batch = self.pending[:BATCH_SIZE]
+				try:
+					ranks = self.post(batch)
+				except (OSError,ValueError):
+					if running:
+						time.sleep(RETRY_DELAY)
+					break
+				del self.pending[:len(batch)]
+				self.last_rank = ranks[-1]
+
+	def post(self,batch):
+		request = urllib.request.Request(self.url.rstrip('/') + '/scores',data = json.dumps({'scores': batch}).encode(),
+			headers = {'Content-Type': 'application/json'},method = 'POST')
+		with urllib.request.urlopen(request,timeout = TIMEOUT) as response:
+			return json.load(response)['ranks']
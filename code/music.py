@@ -0,0 +1,41 @@
+"""Background music streamed through pygame.mixer.music.
+
+A mixer Sound decodes the whole track into memory before it can play; the
+music stream decodes a little at a time while it plays. The track is opened
+on the first call to start(), which the game makes once its first frame is
+on screen, so loading it never delays the window.
+"""
+import pygame
+from settings import *
+from assets import asset_exists, asset_file
+
+class Music:
+	"""Loops the first of the given tracks that exists, e.g. an OGG with a WAV fallback"""
+	def __init__(self,tracks = MUSIC_TRACKS):
+		self.tracks = tracks
+		self.started = False
+		self.track = None
+		# a file opened from the asset pack has to outlive the stream reading it
+		self.file = None
+
+	def start(self):
+		"""Load and loop the music, only the first call does anything"""
+		if self.started:
+			return
+		self.started = True
+		for track in self.tracks:
+			if not asset_exists(track):
+				continue
+			try:
+				self.file = asset_file(track)
+				pygame.mixer.music.load(self.file,track)
+				pygame.mixer.music.play(loops = -1)
+			except pygame.error:
+				# no audio device, or a format this build of SDL_mixer cannot stream
+				continue
+			self.track = track
+			return
+
+	def stop(self):
+		if self.track:
+			pygame.mixer.music.stop()
@@ -0,0 +1,151 @@
+"""Single-file asset pack, read through mmap without extracting anything.
+
+File layout (little endian):
+	magic b'FLPK', version (u16), entry count (u32)
+	per entry: path length (u16), offset (u64), size (u64), path (utf-8, '/' separators)
+	then the file contents, each starting on an 8 byte boundary
+
+A frozen build ships the pack next to the executable (see build_game.py) and
+assets.py opens images, sounds and fonts straight from views into the mapping.
+
+Usage: python pack.py [out.pak] packs graphics/, sounds/ and data/
+"""
+import io, mmap, os, struct, sys
+from settings import *
+
+MAGIC = b'FLPK'
+VERSION = 1
+ALIGN = 8
+_HEADER = struct.Struct('<4sHI')
+_ENTRY = struct.Struct('<HQQ')
+
+class PackError(Exception):
+	pass
+
+class PackFile(io.RawIOBase):
+	"""Read-only file over a slice of the pack, reads copy straight out of the mapping"""
+	def __init__(self,view,name):
+		self.view = view
+		self.name = name
+		self.position = 0
+
+	def readable(self):
+		return True
+
+	def seekable(self):
+		return True
+
+	def readinto(self,buffer):
+		size = min(len(buffer),len(self.view) - self.position)
+		if size <= 0:
+			return 0
+		buffer[:size] = self.view[self.position:self.position + size]
+		self.position += size
+		return size
+
+	def seek(self,offset,whence = io.SEEK_SET):
+		if whence == io.SEEK_CUR:
+			offset += self.position
+		elif whence == io.SEEK_END:
+			offset += len(self.view)
+		self.position = max(offset,0)
+		return self.position
+
+	def tell(self):
+		return self.position
+
+class AssetPack:
+	def __init__(self,path):
+		self.path = path
+		with open(path,'rb') as file:
+			# the mapping stays valid after the file is closed
+			self.mapping = mmap.mmap(file.fileno(),0,access = mmap.ACCESS_READ)
+		self.data = memoryview(self.mapping)
+		self.entries = self.read_index()
+
+	@classmethod
+	def from_bytes(cls,data,path = '<memory>'):
+		"""A pack already in memory, e.g. downloaded (see remote.py)"""
+		pack = cls.__new__(cls)
+		pack.path = path
+		pack.mapping = None
+		pack.data = memoryview(data)
+		pack.entries = pack.read_index()
+		return pack
+
+	def read_index(self):
+		if len(self.data) < _HEADER.size:
+			raise PackError('not an asset pack')
+		magic, version, count = _HEADER.unpack_from(self.data)
+		if magic != MAGIC:
+			raise PackError('not an asset pack')
+		if version != VERSION:
+			raise PackError(f'unsupported asset pack version {version}')
+
+		entries = {}
+		position = _HEADER.size
+		for _ in range(count):
+			length, offset, size = _ENTRY.unpack_from(self.data,position)
+			position += _ENTRY.size
+			name = bytes(self.data[position:position + length]).decode()
+			position += length
+			if offset + size > len(self.data):
+				raise PackError(f'truncated asset pack ({name})')
+			entries[name] = (offset,size)
+		return entries
+
+	def __contains__(self,name):
+		return name in self.entries
+
+	def buffer(self,name):
+		"""Zero-copy view of a packed file"""
+		offset, size = self.entries[name]
+		return self.data[offset:offset + size]
+
+	def open(self,name):
+		return PackFile(self.buffer(name),name)
+
+def write_pack(path,files):
+	"""Pack {name: source path} into path"""
+	names = sorted(files)
+	encoded = [name.encode() for name in names]
+	sizes = [os.path.getsize(files[name]) for name in names]
+
+	# offsets are known up front, the table is written in one go
+	position = _HEADER.size + sum(_ENTRY.size + len(name) for name in encoded)
+	offsets = []
+	for size in sizes:
+		position += -position % ALIGN
+		offsets.append(position)
+		position += size
+
+	with open(path,'wb') as out:
+		out.write(_HEADER.pack(MAGIC,VERSION,len(names)))
+		for name, offset, size in zip(encoded,offsets,sizes):
+			out.write(_ENTRY.pack(len(name),offset,size))
+			out.write(name)
+		for name, offset in zip(names,offsets):
+			out.write(bytes(offset - out.tell()))
+			with open(files[name],'rb') as source:
+				out.write(source.read())
+	return position
+
+def asset_files(root,directories = ('graphics','sounds','data')):
+	"""{'graphics/ui/menu.png': absolute path} of every file under the asset directories"""
+	files = {}
+	for directory in directories:
+		for folder, _, filenames in os.walk(os.path.join(root,directory)):
+			for filename in filenames:
+				source = os.path.join(folder,filename)
+				files[os.path.relpath(source,root).replace(os.sep,'/')] = source
+	return files
+
+def main(argv):
+	from assets import BASE_DIR
+	out = argv[0] if argv else os.path.join(BASE_DIR,ASSET_PACK)
+	files = asset_files(BASE_DIR)
+	size = write_pack(out,files)
+	print(f'📦 packed {len(files)} files into {out} ({size / 1024:.0f} KB)')
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,135 @@
+"""Opt-in frame-time profiler with an on-screen overlay.
+
+The game loop calls frame() once per frame and lap(phase) after each phase;
+a lap is the time since the previous lap, minus the time spent in methods
+wrapped with track() (those are counted in their own phase). The last N
+frames live in preallocated arrays, so profiling does not allocate per frame.
+
+Turn it on with FLAPPY_PROFILE=1 or the F3 key. With FLAPPY_PROFILE_DUMP set
+the buffer is written there as CSV (microseconds) when the game quits.
+"""
+import pygame
+from array import array
+from time import perf_counter_ns
+from settings import *
+
+class FrameProfiler:
+	def __init__(self,phases,frames = PROFILE_FRAMES,enabled = PROFILE):
+		self.phases = list(phases)
+		self.index = {phase: i for i, phase in enumerate(self.phases)}
+		self.size = frames
+		self.enabled = enabled
+
+		# ring buffer: totals[frame], samples[phase][frame] in nanoseconds
+		self.totals = array('q',bytes(8 * frames))
+		self.samples = [array('q',bytes(8 * frames)) for _ in self.phases]
+		self.reset()
+
+		# overlay
+		self.font = None
+		self.stats = None
+		self.stats_frame = 0
+
+	def reset(self):
+		self.frame_index = -1
+		self.count = 0
+		self.frame_start = self.last_lap = perf_counter_ns()
+		self.nested = 0
+
+	def toggle(self):
+		self.enabled = not self.enabled
+		self.reset()
+
+	# recording
+	def frame(self):
+		"""Close the previous frame and start a new one"""
+		if not self.enabled:
+			return
+		now = perf_counter_ns()
+		if self.frame_index >= 0:
+			self.totals[self.frame_index] = now - self.frame_start
+			self.count = min(self.count + 1,self.size - 1)
+		self.frame_index = (self.frame_index + 1) % self.size
+		for samples in self.samples:
+			samples[self.frame_index] = 0
+		self.frame_start = self.last_lap = now
+		self.nested = 0
+
+	def lap(self,phase):
+		"""Charge the time since the last lap to phase"""
+		if not self.enabled:
+			return
+		now = perf_counter_ns()
+		self.samples[self.index[phase]][self.frame_index] += now - self.last_lap - self.nested
+		self.last_lap = now
+		self.nested = 0
+
+	def track(self,obj,name,phase = None):
+		"""Time every call of obj.name in its own phase"""
+		method = getattr(obj,name)
+		samples = self.samples[self.index[phase or name]]
+		def timed(*args,**kwargs):
+			if not self.enabled:
+				return method(*args,**kwargs)
+			start = perf_counter_ns()
+			result = method(*args,**kwargs)
+			elapsed = perf_counter_ns() - start
+			samples[self.frame_index] += elapsed
+			self.nested += elapsed
+			return result
+		setattr(obj,name,timed)
+
+	# reading
+	def frames_in_order(self):
+		"""Indices of the finished frames, oldest first (the current frame keeps one slot)"""
+		end = self.frame_index
+		return [(end - self.count + i) % self.size for i in range(self.count)]
+
+	def summary(self):
+		"""fps, p50 / p99 frame time and mean time per phase (ms) over the buffer"""
+		frames = self.frames_in_order()
+		if not frames:
+			return None
+		totals = sorted(self.totals[i] for i in frames)
+		mean = sum(totals) / len(totals)
+		return {
+			'fps': 1e9 / mean if mean else 0,
+			'p50': totals[len(totals) // 2] / 1e6,
+			'p99': totals[min(len(totals) - 1,len(totals) * 99 // 100)] / 1e6,
+			'phases': [(phase,sum(samples[i] for i in frames) / len(frames) / 1e6) for phase, samples in zip(self.phases,self.samples)]}
+
+	def dump(self,path):
+		with open(path,'w') as file:
+			file.write(','.join(['frame_us'] + [f'{phase}_us' for phase in self.phases]) + '\n')
+			for i in self.frames_in_order():
+				file.write(','.join(str(value[i] // 1000) for value in [self.totals] + self.samples) + '\n')
+
+	# overlay
+	def draw(self,surface):
+		"""Draw fps, frame time percentiles and per-phase bars, returns the drawn rect"""
+		if not self.enabled:
+			return None
+		# the percentiles need a sort, refresh them a few times per second only
+		if self.stats is None or self.frame_index - self.stats_frame >= FRAMERATE // 4 or self.frame_index < self.stats_frame:
+			self.stats = self.summary()
+			self.stats_frame = self.frame_index
+		if self.stats is None:
+			return None
+		if self.font is None:
+			self.font = pygame.font.Font(None,18)
+
+		budget = 1000 / FRAMERATE
+		line_height = 16
+		bar_width = 100
+		rect = pygame.Rect(4,4,240,line_height * (len(self.phases) + 1) + 8)
+		surface.fill((0,0,0),rect)
+
+		stats = self.stats
+		text = f"{stats['fps']:.0f} fps  p50 {stats['p50']:.2f} ms  p99 {stats['p99']:.2f} ms"
+		surface.blit(self.font.render(text,False,'white'),(rect.x + 4,rect.y + 4))
+		for row, (phase, ms) in enumerate(stats['phases'],1):
+			y = rect.y + 4 + row * line_height
+			surface.blit(self.font.render(f'{phase} {ms:.2f}',False,'white'),(rect.x + 4,y))
+			width = min(round(ms / budget * bar_width),bar_width)
+			pygame.draw.rect(surface,'orange' if ms > budget / 2 else 'green',(rect.right - bar_width - 4,y + 2,max(width,1),line_height - 6))
+		return rect
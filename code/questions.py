@@ -0,0 +1,188 @@
+"""Quiz question bank: one JSON question per line plus an offset index.
+
+A question is {"question": str, "answers": [str, ...], "correct": index into
+answers, "topic": str}. QUESTION_BANK (.jsonl) holds one per line and the
+index next to it (.idx) the byte offset of every line (little endian):
+	magic b'FLQI', version (u16), question count (u32), bank size in bytes (u64)
+	then the offset of each line (u64)
+
+Opening a bank reads only the index header; each question is read from disk
+when it is first asked. QuestionDeck picks the order, so startup and memory
+stay the same however many questions the bank holds.
+
+Usage: python questions.py [bank.jsonl] rebuilds the index after editing a bank.
+"""
+import hashlib, io, json, os, random, struct, sys
+from settings import *
+
+MAGIC = b'FLQI'
+VERSION = 1
+_HEADER = struct.Struct('<4sHIQ')
+_OFFSET = struct.Struct('<Q')
+_MASK64 = (1 << 64) - 1
+
+class QuestionBankError(Exception):
+	pass
+
+def index_path(path):
+	return os.path.splitext(path)[0] + '.idx'
+
+def make_index(path):
+	"""The offset index of a bank given as a file path"""
+	offsets = []
+	with open(path,'rb') as file:
+		position = 0
+		for line in file:
+			if line.strip():
+				offsets.append(position)
+			position += len(line)
+	return _HEADER.pack(MAGIC,VERSION,len(offsets),position) + b''.join(_OFFSET.pack(offset) for offset in offsets)
+
+def build_index(path):
+	"""Write the offset index of a bank given as a file path, returns the question count"""
+	index = make_index(path)
+	with open(index_path(path),'wb') as out:
+		out.write(index)
+	return (len(index) - _HEADER.size) // _OFFSET.size
+
+def question_id(question):
+	"""Stable id of a question: the same wherever it sits in the bank, new when the question is edited"""
+	text = json.dumps([question['question'],question['answers'],question['correct']],separators = (',',':'))
+	return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+def _open(file):
+	return open(file,'rb') if isinstance(file,str) else file
+
+class QuestionBank:
+	"""Questions by position in the bank, read the first time they are asked"""
+	def __init__(self,lines,index):
+		self.lines = _open(lines)
+		self.index = _open(index)
+		header = self.index.read(_HEADER.size)
+		if len(header) < _HEADER.size:
+			raise QuestionBankError('not a question index')
+		magic, version, self.count, self.size = _HEADER.unpack(header)
+		if magic != MAGIC:
+			raise QuestionBankError('not a question index')
+		if version != VERSION:
+			raise QuestionBankError(f'unsupported question index version {version}')
+		if self.lines.seek(0,os.SEEK_END) != self.size:
+			raise QuestionBankError('question index is out of date, run questions.py')
+		self.cache = {}
+
+	@classmethod
+	def open(cls,path = QUESTION_BANK):
+		"""The bank at a path relative to BASE_DIR, loose banks get their index rebuilt when it is stale
+
+		The rebuilt index is saved next to the bank for the next start, or only
+		kept in memory when the install is read-only.
+		"""
+		# here, not at the top: the simulation uses the deck and stays free of pygame
+		from assets import asset_file
+		try:
+			return cls(asset_file(path),asset_file(index_path(path)))
+		except (OSError,QuestionBankError):
+			source = asset_file(path)
+			if not isinstance(source,str):
+				raise
+		index = make_index(source)
+		try:
+			with open(index_path(source),'wb') as out:
+				out.write(index)
+		except OSError:
+			pass
+		return cls(source,io.BytesIO(index))
+
+	def __len__(self):
+		return self.count
+
+	def __getitem__(self,position):
+		question = self.cache.get(position)
+		if question is None:
+			if not 0 <= position < self.count:
+				raise IndexError(position)
+			self.index.seek(_HEADER.size + position * _OFFSET.size)
+			start, = _OFFSET.unpack(self.index.read(_OFFSET.size))
+			if position + 1 < self.count:
+				end, = _OFFSET.unpack(self.index.read(_OFFSET.size))
+			else:
+				end = self.size
+			self.lines.seek(start)
+			question = json.loads(self.lines.read(end - start))
+			self.cache[position] = question
+		return question
+
+def _mix(value):
+	# splitmix64 finalizer
+	value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+	value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK64
+	return value ^ (value >> 31)
+
+class QuestionDeck:
+	"""Deals every question of a bank once, in shuffled order, before any comes back
+
+	The order is a keyed permutation of the positions (a small Feistel
+	network, cycle-walked into range) computed one draw at a time instead of
+	shuffling a list, so the whole state is (key,position). A new key starts
+	the next round once every question was dealt.
+	"""
+	ROUNDS = 4
+
+	def __init__(self,size,key,position = 0):
+		if size <= 0:
+			raise QuestionBankError('empty question bank')
+		self.size = size
+		self.key = key & _MASK64
+		self.position = position
+		self.half = (max((size - 1).bit_length(),2) + 1) // 2
+		self.mask = (1 << self.half) - 1
+
+	def permute(self,value):
+		left, right = value >> self.half, value & self.mask
+		for round in range(self.ROUNDS):
+			left, right = right, left ^ (_mix(self.key + round * 0x9E3779B97F4A7C15 + right & _MASK64) & self.mask)
+		return (left << self.half) | right
+
+	def question_at(self,position):
+		value = self.permute(position)
+		while value >= self.size:
+			value = self.permute(value)
+		return value
+
+	def draw(self):
+		"""Position of the next question in the bank"""
+		if self.position >= self.size:
+			self.key = _mix(self.key + 1)
+			self.position = 0
+		question = self.question_at(self.position)
+		self.position += 1
+		return question
+
+	def state(self):
+		return {'size': self.size, 'key': self.key, 'position': self.position}
+
+	def save(self,path):
+		with open(path + '.tmp','w') as file:
+			json.dump(self.state(),file)
+		os.replace(path + '.tmp',path)
+
+	@classmethod
+	def load(cls,path,size):
+		"""The deck saved by the last session, a freshly shuffled one if there is none or the bank changed"""
+		try:
+			with open(path) as file:
+				state = json.load(file)
+			if state['size'] == size:
+				return cls(size,state['key'],state['position'])
+		except (OSError,ValueError,KeyError,TypeError):
+			pass
+		return cls(size,random.getrandbits(64))
+
+def main(argv):
+	from assets import asset_path
+	path = argv[0] if argv else asset_path(QUESTION_BANK)
+	count = build_index(path)
+	print(f'❓ indexed {count} questions in {index_path(path)}')
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
@@ -0,0 +1,82 @@
+"""Gameplay assets fetched while the start screen is already up (web build).
+
+build_web.py splits the web build in two: the boot bundle pygbag downloads
+before Python starts (the code and the font, all the start screen needs)
+and one gameplay pack (pack.py) with everything else, images recompressed
+and sounds as OGG. The boot bundle carries BOOT_MANIFEST naming the pack;
+the runner starts the download before the first frame and the loading
+stages wait for it (see Game.load_stages). A failed or short download is
+tried again until the pack arrives, the start screen says so meanwhile.
+"""
+import asyncio, json, os, time, zlib
+from settings import *
+from assets import asset_path, use_pack
+from pack import AssetPack, PackError
+
+# pygbag's output folder inside the boot bundle, where index.html and the gameplay pack are served from
+LOCAL_WEB_DIR = 'build/web'
+
+async def fetch(url):
+	"""Bytes of a file next to the page; outside the browser (a staged boot bundle run locally) from LOCAL_WEB_DIR"""
+	if BROWSER:
+		import platform
+		# pygbag downloads into its virtual filesystem without blocking the page
+		async with platform.fopen(url,'rb') as file:
+			return file.read()
+	with open(asset_path(LOCAL_WEB_DIR + '/' + url),'rb') as file:
+		return file.read()
+
+class PackDownload:
+	def __init__(self,url,size = None,compression = None):
+		self.url = url
+		self.size = size
+		self.compression = compression
+		self.done = False
+		# the last failure and when the next attempt starts (time.monotonic), None once it arrived
+		self.error = None
+		self.retry_at = None
+
+	@classmethod
+	def from_manifest(cls,path = BOOT_MANIFEST):
+		"""The download a boot bundle asks for, None when all assets are already here"""
+		if not os.path.exists(asset_path(path)):
+			return None
+		with open(asset_path(path)) as file:
+			manifest = json.load(file)
+		return cls(manifest['pack'],manifest.get('size'),manifest.get('compression'))
+
+	async def fetch_pack(self):
+		data = await fetch(self.url)
+		if self.size is not None and len(data) != self.size:
+			raise PackError(f'{self.url}: got {len(data)} of {self.size} bytes')
+		if self.compression == 'zlib':
+			data = zlib.decompress(data)
+		return AssetPack.from_bytes(data,self.url)
+
+	async def run(self):
+		"""Fetch and install the pack, retrying after a growing delay until it arrives"""
+		delay = DOWNLOAD_RETRY_DELAY
+		while True:
+			try:
+				pack = await self.fetch_pack()
+				break
+			except (OSError,PackError,zlib.error) as error:
+				self.error = error
+			self.retry_at = time.monotonic() + delay
+			await asyncio.sleep(delay)
+			delay = min(delay * 2,DOWNLOAD_RETRY_MAX)
+		use_pack(pack)
+		self.error = self.retry_at = None
+		self.done = True
+
+	def status(self):
+		"""What the start screen says about the download, None while nothing went wrong"""
+		if self.error is None:
+			return None
+		seconds = max(int(self.retry_at - time.monotonic() + 0.999),0)
+		return f'Download failed, retrying in {seconds}s' if seconds else 'Download failed, retrying...'
+
+	def wait(self):
+		"""Loading stage: yields until the pack is installed"""
+		while not self.done:
+			yield
@@ -0,0 +1,52 @@
+import pygame
+from settings import *
+
+class Renderer:
+	"""Presents frames either with a full redraw + flip, or with dirty rectangles
+
+	In dirty mode static screens (start, quiz, game over) are drawn once and
+	then left alone until their key changes, and only the regions that were
+	actually drawn are handed to pygame.display.update.
+	"""
+	def __init__(self,surface,dirty = DIRTY_RECTS):
+		self.surface = surface
+		self.dirty = dirty
+		self.scene = None
+		self.rects = []
+
+	def begin_frame(self):
+		"""Start a frame that redraws the moving world"""
+		self.scene = None
+		# the scrolling background covers the whole window, the fill is only
+		# needed when every frame is presented as a full redraw
+		if not self.dirty:
+			self.surface.fill('black')
+		self.rects.append(self.surface.get_rect())
+
+	def draw_static(self,key,draw):
+		"""Draw a screen that only changes when its key changes"""
+		if self.dirty and key == self.scene:
+			return
+		draw()
+		self.scene = key
+		self.rects.append(self.surface.get_rect())
+
+	def add_rect(self,rect):
+		"""Present an extra region drawn on top of the frame (e.g. an overlay)"""
+		self.rects.append(rect)
+
+	def invalidate(self):
+		"""Force the next static screen to be redrawn (e.g. window exposed)"""
+		self.scene = None
+
+	def present(self):
+		"""Flip the frame, returns False when there was nothing to show"""
+		if not self.dirty:
+			self.rects.clear()
+			pygame.display.update()
+			return True
+		if not self.rects:
+			return False
+		pygame.display.update(self.rects)
+		self.rects.clear()
+		return True
@@ -0,0 +1,148 @@
+"""Compact input replays: a seed plus tick-indexed inputs reproduce a whole run.
+
+File layout (little endian):
+	magic b'FLPR', version (u8), tick rate (u16), seed (u64)
+	then per input: ticks since the previous input (varint), input code (u8)
+	and for INPUT_ASK the question's position in the bank (varint)
+	and a final END code carrying the ticks after the last input
+
+Usage: python replay.py <file.flr> [...] prints how each recorded run ended.
+"""
+import os, struct, sys, time
+from settings import *
+from simulation import Simulation, INPUT_ASK
+from questions import QuestionBank
+
+MAGIC = b'FLPR'
+VERSION = 3
+END = 0xFF
+_HEADER = struct.Struct('<4sBHQ')
+
+class ReplayError(Exception):
+	pass
+
+def write_varint(out,value):
+	while value >= 0x80:
+		out.append((value & 0x7F) | 0x80)
+		value >>= 7
+	out.append(value)
+
+def read_varint(data,offset):
+	value = shift = 0
+	while True:
+		if offset >= len(data):
+			raise ReplayError('truncated replay')
+		byte = data[offset]
+		offset += 1
+		value |= (byte & 0x7F) << shift
+		if byte < 0x80:
+			return value, offset
+		shift += 7
+
+class Replay:
+	def __init__(self,seed,tick_rate = TICK_RATE,inputs = None,ticks = 0):
+		self.seed = seed
+		self.tick_rate = tick_rate
+		# [(tick,input code)] in the order they were applied, (tick,INPUT_ASK,question) for questions
+		self.inputs = inputs if inputs is not None else []
+		self.ticks = ticks
+
+	def to_bytes(self):
+		out = bytearray(_HEADER.pack(MAGIC,VERSION,self.tick_rate,self.seed))
+		last_tick = 0
+		for tick, code, *value in self.inputs:
+			write_varint(out,tick - last_tick)
+			out.append(code)
+			if code == INPUT_ASK:
+				write_varint(out,value[0])
+			last_tick = tick
+		write_varint(out,max(self.ticks - last_tick,0))
+		out.append(END)
+		return bytes(out)
+
+	@classmethod
+	def from_bytes(cls,data):
+		if len(data) < 5 or data[:4] != MAGIC:
+			raise ReplayError('not a replay file')
+		# checked before the header, its size depends on the version
+		if data[4] != VERSION:
+			raise ReplayError(f'unsupported replay version {data[4]}')
+		if len(data) < _HEADER.size:
+			raise ReplayError('truncated replay')
+		magic, version, tick_rate, seed = _HEADER.unpack_from(data)
+
+		inputs = []
+		tick = 0
+		offset = _HEADER.size
+		while True:
+			delta, offset = read_varint(data,offset)
+			if offset >= len(data):
+				raise ReplayError('truncated replay')
+			code = data[offset]
+			offset += 1
+			tick += delta
+			if code == END:
+				return cls(seed,tick_rate,inputs,tick)
+			if code == INPUT_ASK:
+				question, offset = read_varint(data,offset)
+				inputs.append((tick,code,question))
+			else:
+				inputs.append((tick,code))
+
+	def save(self,path):
+		with open(path,'wb') as file:
+			file.write(self.to_bytes())
+
+	@classmethod
+	def load(cls,path):
+		with open(path,'rb') as file:
+			return cls.from_bytes(file.read())
+
+class ReplayRecorder:
+	"""Attach to a Simulation to record every input it receives"""
+	def __init__(self,sim):
+		self.sim = sim
+		self.replay = Replay(sim.seed,sim.tick_rate)
+		sim.recorder = self
+
+	def record(self,tick,code,value = None):
+		self.replay.inputs.append((tick,code) if value is None else (tick,code,value))
+
+	def finish(self):
+		self.replay.ticks = self.sim.ticks
+		return self.replay
+
+def play(replay,hitboxes,questions):
+	"""Re-run a replay headless, as fast as the simulation steps; returns the Simulation"""
+	sim = Simulation(hitboxes,questions,replay.seed,replay.tick_rate)
+	for tick, code, *value in replay.inputs:
+		while sim.ticks < tick:
+			sim.step()
+		sim.apply_input(code,*value)
+	while sim.ticks < replay.ticks:
+		sim.step()
+	return sim
+
+def save_session(recorder):
+	"""Save a game session's replay into REPLAY_DIR (see settings), returns the path"""
+	os.makedirs(REPLAY_DIR,exist_ok = True)
+	path = os.path.join(REPLAY_DIR,time.strftime('%Y%m%d-%H%M%S') + f'-{recorder.sim.seed}.flr')
+	recorder.finish().save(path)
+	return path
+
+def main(paths):
+	from hitboxes import load_hitboxes
+
+	hitboxes = load_hitboxes()
+	questions = QuestionBank.open()
+	for path in paths:
+		replay = Replay.load(path)
+		start = time.perf_counter()
+		sim = play(replay,hitboxes,questions)
+		elapsed = time.perf_counter() - start
+		speed = replay.ticks / replay.tick_rate / elapsed if elapsed else float('inf')
+		print(f'{path}: seed {replay.seed}, {len(replay.inputs)} inputs, {replay.ticks} ticks, '
+			f'score {sim.score}, crash {sim.crash_cause}, question {sim.current_question} ({speed:.0f}x real time)')
+
+if __name__ == '__main__':
+	main(sys.argv[1:])
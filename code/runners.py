@@ -0,0 +1,79 @@
+"""Loops that drive a Game: blocking for desktop, asyncio for pygbag (web)."""
+import asyncio, time
+import pygame
+from settings import *
+
+class DesktopRunner:
+	"""Blocking loop, the clock caps the frame rate and sleeps between frames"""
+	def __init__(self,game):
+		self.game = game
+		self.idle = False
+
+	def run(self):
+		game = self.game
+		if game.download:
+			asyncio.run(self.load_with_download())
+		else:
+			for _ in game.loading():
+				pass
+		while game.running:
+			game.profiler.frame()
+			frame_time = game.clock.tick(IDLE_FRAMERATE if self.idle else FRAMERATE) / 1000
+			game.profiler.lap('wait')
+			# nothing changed on screen, no need to come back at full frame rate
+			self.idle = not game.frame(frame_time)
+		pygame.quit()
+
+	async def load_with_download(self):
+		"""A boot bundle staged locally: fetch behind the start screen as the web build does"""
+		game = self.game
+		game.download_task = asyncio.ensure_future(game.download.run())
+		for _ in game.loading():
+			await asyncio.sleep(1 / FRAMERATE)
+
+class AsyncRunner:
+	"""asyncio loop for pygbag, every frame awaits once so the browser gets control back
+
+	In the browser pygbag resumes the loop from requestAnimationFrame, so
+	sleep(0) waits for the next display frame and the game runs at the
+	display's rate; the tab being hidden stops the callbacks altogether.
+	Outside the browser (testing main_web.py locally) the loop sleeps until
+	the next frame is due instead of spinning. Idle frames are paced to
+	IDLE_FRAMERATE either way.
+	"""
+	def __init__(self,game):
+		self.game = game
+		self.idle = False
+
+	async def run(self):
+		game = self.game
+		# fetched while the start screen is up, the loading stages wait for it
+		if game.download:
+			game.download_task = asyncio.ensure_future(game.download.run())
+		for _ in game.loading():
+			await asyncio.sleep(0)
+		last = deadline = time.perf_counter()
+		while game.running:
+			game.profiler.frame()
+			if BROWSER and not self.idle:
+				await asyncio.sleep(0)
+			else:
+				deadline += 1 / (IDLE_FRAMERATE if self.idle else FRAMERATE)
+				now = time.perf_counter()
+				if deadline < now:
+					# running late, start counting again from now instead of rushing frames
+					deadline = now
+				await asyncio.sleep(deadline - now)
+			if BROWSER and page_hidden():
+				# nothing to show in a hidden tab, the gap is dropped once it is back (SUSPEND_GAP)
+				continue
+			now = time.perf_counter()
+			frame_time, last = now - last, now
+			game.profiler.lap('wait')
+			self.idle = not game.frame(frame_time)
+		pygame.quit()
+
+def page_hidden():
+	"""document.hidden of the page the game runs in"""
+	import platform
+	return bool(platform.window.document.hidden)
@@ -1,3 +1,80 @@
+import os, sys
+
 WINDOW_WIDTH = 480
 WINDOW_HEIGHT = 800
-FRAMERATE = 120
\ No newline at end of file
+FRAMERATE = 120
+
+# plane rotation cache (degrees)
+ROTATION_STEP = 2
+ROTATION_MIN_ANGLE = -90
+ROTATION_MAX_ANGLE = 30
+
+# obstacles
+OBSTACLE_POOL_SIZE = 6
+
+# rendering
+DIRTY_RECTS = False
+IDLE_FRAMERATE = 30
+TEXT_CACHE_SIZE = 64
+# pre-scaled sprites baked by bake.py for this window size (.png + .json)
+ATLAS_PATH = 'graphics/atlas'
+# single-file asset pack (see pack.py), used next to a frozen executable or when given here
+ASSET_PACK = 'assets.pak'
+ASSET_PACK_PATH = os.environ.get('FLAPPY_ASSET_PACK')
+
+# web build (see build_web.py): running under pygbag (WebAssembly)
+BROWSER = sys.platform == 'emscripten'
+# the boot bundle carries this manifest, it names the gameplay pack fetched behind the start screen
+BOOT_MANIFEST = 'boot.json'
+WEB_PACK = 'gameplay.pak'
+# a failed download is tried again after this many seconds, doubling up to the max
+DOWNLOAD_RETRY_DELAY = 2
+DOWNLOAD_RETRY_MAX = 30
+
+# background music, the first track that exists is streamed (see music.py)
+MUSIC_TRACKS = ('sounds/music.ogg','sounds/music.wav')
+
+# startup timings are appended here as JSON lines when set (see startup.py)
+STARTUP_LOG = os.environ.get('FLAPPY_STARTUP_LOG')
+# quit as soon as the game is interactive, for measuring launches
+STARTUP_EXIT = bool(os.environ.get('FLAPPY_STARTUP_EXIT'))
+
+# fixed timestep simulation
+TICK_RATE = FRAMERATE
+TIMESTEP = 1 / TICK_RATE
+MAX_FRAME_TIME = 0.25
+# at most this many steps per frame, a slow device drops time instead of falling further behind
+MAX_STEPS_PER_FRAME = 8
+# a longer gap between frames means the window was hidden or throttled, the time is dropped
+SUSPEND_GAP = 0.5
+
+# physics (pixels and seconds)
+GRAVITY = 600
+JUMP_VELOCITY = -400
+BG_SPEED = 300
+GROUND_SPEED = 360
+OBSTACLE_SPEED = 400
+OBSTACLE_SPAWN_INTERVAL = 1.4
+PLANE_ANIMATION_SPEED = 10
+
+# quiz questions (see questions.py) and where the deck's place is kept between sessions
+QUESTION_BANK = 'data/questions.jsonl'
+QUESTION_STATE = os.environ.get('FLAPPY_QUESTION_STATE') or os.path.join(os.path.expanduser('~'),'.flappy_drone_questions.json')
+# per-question answer statistics and the player's level (see difficulty.py)
+QUESTION_STATS = os.environ.get('FLAPPY_QUESTION_STATS') or os.path.join(os.path.expanduser('~'),'.flappy_drone_quiz_stats.json')
+
+# final scores are posted to this leaderboard service when set (see leaderboard.py)
+LEADERBOARD_URL = os.environ.get('FLAPPY_LEADERBOARD_URL')
+PLAYER_NAME = os.environ.get('FLAPPY_PLAYER','player')
+
+# gameplay events are logged here when set (see telemetry.py), a new file past the size in bytes
+TELEMETRY_DIR = os.environ.get('FLAPPY_TELEMETRY_DIR')
+TELEMETRY_FILE_SIZE = 4 * 1024 * 1024
+
+# replays of every session are saved here when set
+REPLAY_DIR = os.environ.get('FLAPPY_REPLAY_DIR')
+
+# frame profiler (see profiler.py), also toggled with F3
+PROFILE = bool(os.environ.get('FLAPPY_PROFILE'))
+PROFILE_FRAMES = 600
+PROFILE_DUMP = os.environ.get('FLAPPY_PROFILE_DUMP')
\ No newline at end of file
@@ -0,0 +1,324 @@
+"""Headless game core: plane physics, obstacles, collisions, scoring and quiz state.
+
+Pure Python, no pygame: a Simulation can be stepped without a window, audio
+or event queue. Positions are window pixels (top-left corners, like the
+sprite rects), time advances in fixed ticks of 1 / tick_rate seconds.
+main.py and main_web.py feed it input and draw it through view.WorldView.
+"""
+import random
+from settings import *
+from collision import SweepList
+from questions import QuestionDeck
+
+# inputs, as recorded in replays (see replay.py)
+INPUT_START = 0
+INPUT_JUMP = 1
+INPUT_RESPAWN = 2
+INPUT_RESTART = 3
+INPUT_ANSWER = 4 # + answer index
+INPUT_ASK = 0xFE # followed by the question's position in the bank
+
+def rotation_bucket(angle):
+	"""Index of the pre-rendered rotation closest to angle (see sprites.RotationCache)"""
+	bucket = round((angle - ROTATION_MIN_ANGLE) / ROTATION_STEP)
+	last_bucket = int((ROTATION_MAX_ANGLE - ROTATION_MIN_ANGLE) / ROTATION_STEP)
+	if bucket < 0:
+		return 0
+	if bucket > last_bucket:
+		return last_bucket
+	return bucket
+
+class Scroller:
+	"""Endlessly scrolling strip (background, ground) that wraps at half its width"""
+	def __init__(self,speed,width,y = 0):
+		self.speed = speed
+		self.width = width
+		self.y = self.previous_y = y
+		self.reset()
+
+	def reset(self):
+		self.x = self.previous_x = 0
+		self.rect_x = 0
+
+	def step(self,dt):
+		self.previous_x = self.x
+		self.x -= self.speed * dt
+		if self.rect_x + self.width // 2 <= 0:
+			# keep the interpolation continuous across the wrap
+			self.previous_x -= self.x
+			self.x = 0
+		self.rect_x = round(self.x)
+
+class PlaneBody:
+	def __init__(self,hitboxes):
+		self.shapes = hitboxes.plane
+		self.frame_count = len(self.shapes)
+		self.width, self.height = hitboxes.plane_size
+		self.start_x = round(WINDOW_WIDTH / 20)
+		self.start_y = round(WINDOW_HEIGHT / 2) - self.height // 2
+		self.alive = False
+		self.reset()
+
+	def reset(self):
+		self.x = self.previous_x = self.rect_x = self.start_x
+		self.y = self.previous_y = self.rect_y = self.start_y
+		self.velocity = 0
+		self.frame_index = 0
+
+	@property
+	def angle(self):
+		return -self.velocity * 0.06
+
+	@property
+	def shape(self):
+		return self.shapes[int(self.frame_index)][rotation_bucket(self.angle)]
+
+	def jump(self):
+		self.velocity = JUMP_VELOCITY
+
+	def step(self,dt):
+		self.previous_y = self.y
+		self.velocity += GRAVITY * dt
+		self.y += self.velocity * dt
+		self.rect_y = round(self.y)
+
+		self.frame_index += PLANE_ANIMATION_SPEED * dt
+		if self.frame_index >= self.frame_count:
+			self.frame_index = 0
+
+class ObstacleBody:
+	def __init__(self):
+		self.active = False
+		# bumped on every spawn so views can tell a recycled obstacle apart
+		self.spawn_id = 0
+		self.x = self.previous_x = 0
+		self.y = self.previous_y = 0
+		self.rect_x = self.rect_y = 0
+		self.shape = None
+
+	def spawn(self,rng,hitboxes):
+		"""Re-roll orientation, variant and position like the original Obstacle sprite"""
+		orientation = rng.choice(('up','down'))
+		self.variant = rng.choice((0,1))
+		self.flip = orientation == 'down'
+		self.shape = hitboxes.obstacles[(self.variant,self.flip)]
+
+		x = WINDOW_WIDTH + rng.randint(40,100)
+		if orientation == 'up':
+			top = WINDOW_HEIGHT + rng.randint(10,50) - self.shape.height
+		else:
+			top = rng.randint(-50,-10)
+
+		self.x = self.previous_x = self.rect_x = x - self.shape.width // 2
+		self.y = self.previous_y = self.rect_y = top
+		self.active = True
+		self.spawn_id += 1
+
+	def step(self,dt):
+		self.previous_x = self.x
+		self.x -= OBSTACLE_SPEED * dt
+		self.rect_x = round(self.x)
+		if self.rect_x + self.shape.width <= -100:
+			self.active = False
+
+class Simulation:
+	"""One game: start screen -> playing -> crash -> quiz -> playing / game over"""
+	def __init__(self,hitboxes,questions,seed = None,tick_rate = TICK_RATE,deck = None):
+		self.hitboxes = hitboxes
+		# every run is seeded, so any game can be replayed from its inputs
+		self.seed = random.randrange(2 ** 32) if seed is None else seed
+		self.rng = random.Random(self.seed)
+		self.tick_rate = tick_rate
+		self.recorder = None
+		# gameplay events, see telemetry.py
+		self.telemetry = None
+		self.dt = 1 / tick_rate
+
+		# world
+		self.background = Scroller(BG_SPEED,hitboxes.background_width)
+		self.ground = Scroller(GROUND_SPEED,hitboxes.ground.width,WINDOW_HEIGHT - hitboxes.ground.height)
+		self.plane = PlaneBody(hitboxes)
+		self.obstacles = [ObstacleBody() for _ in range(OBSTACLE_POOL_SIZE)]
+		# active obstacles by x, the collision broad phase
+		self.sweep = SweepList()
+
+		# state
+		self.started = False
+		self.active = False
+		self.ticks = 0
+		self.spawn_timer = 0
+		self.crash_cause = None
+
+		# score
+		self.score = 0
+		self.session_ticks = 0
+		self.accumulated_score = 0
+		self.current_session_score = 0
+
+		# quiz system: questions in a QuestionBank, the deck picks which one a crash asks
+		self.quiz_mode = False
+		self.current_question = 0
+		self.questions = questions
+		self.deck = deck or QuestionDeck(len(questions),self.seed)
+		self.question = None
+
+	# input
+	def record(self,code,value = None):
+		if self.recorder:
+			self.recorder.record(self.ticks,code,value)
+
+	def apply_input(self,code,value = None):
+		if code == INPUT_START:
+			self.start()
+		elif code == INPUT_JUMP:
+			self.jump()
+		elif code == INPUT_RESPAWN:
+			self.respawn()
+		elif code == INPUT_RESTART:
+			self.restart()
+		elif code == INPUT_ASK:
+			self.ask(value)
+		else:
+			self.answer(code - INPUT_ANSWER)
+
+	def start(self):
+		self.record(INPUT_START)
+		self.started = True
+		self.spawn_plane()
+
+	def jump(self):
+		if not self.active:
+			return False
+		self.record(INPUT_JUMP)
+		self.plane.jump()
+		if self.telemetry:
+			self.telemetry.jump(self.ticks)
+		return True
+
+	def respawn(self):
+		self.record(INPUT_RESPAWN)
+		self.spawn_plane()
+
+	def spawn_plane(self):
+		self.plane.reset()
+		self.plane.alive = True
+		self.active = True
+		self.quiz_mode = False
+		self.crash_cause = None
+		self.session_ticks = 0
+
+	def restart(self):
+		"""Reset the game to its initial state and fly again"""
+		self.record(INPUT_RESTART)
+		if self.telemetry:
+			self.telemetry.restart(self.score)
+		self.score = 0
+		self.accumulated_score = 0
+		self.current_session_score = 0
+		self.current_question = 0
+		self.background.reset()
+		self.ground.reset()
+		self.clear_obstacles()
+		self.spawn_plane()
+
+	def ask(self,question):
+		"""Ask this question (its position in the bank) in the current quiz instead of the deck's next one"""
+		if not self.quiz_mode:
+			return
+		self.record(INPUT_ASK,question)
+		self.question = question
+
+	def current_question_data(self):
+		# nobody chose the question, the deck deals it; recorded like a chosen one,
+		# replays do not depend on the deck (it carries over between sessions)
+		if self.question is None:
+			self.ask(self.deck.draw())
+		return self.questions[self.question]
+
+	def answer(self,answer_index):
+		"""Answer the quiz after a crash, returns whether the answer was correct"""
+		if not self.quiz_mode:
+			return False
+		self.record(INPUT_ANSWER + answer_index)
+		if answer_index == self.current_question_data()["correct"]:
+			# continue playing with the accumulated score
+			self.accumulated_score += self.current_session_score
+			self.current_session_score = 0
+			self.current_question += 1
+			self.spawn_plane()
+			return True
+		# wrong answer - reset everything and stay in game over state
+		self.accumulated_score = 0
+		self.current_session_score = 0
+		self.current_question = 0
+		self.quiz_mode = False
+		return False
+
+	# simulation
+	def spawn_obstacle(self):
+		for body in self.obstacles:
+			if not body.active:
+				break
+		else:
+			# pool exhausted, recycle the obstacle that is furthest along
+			body = min(self.obstacles,key = lambda body: body.x)
+		body.spawn(self.rng,self.hitboxes)
+		self.sweep.add(body)
+		return body
+
+	def clear_obstacles(self):
+		for body in self.obstacles:
+			body.active = False
+		self.sweep.clear()
+
+	def step(self):
+		"""Advance the world by one fixed tick"""
+		dt = self.dt
+		self.ticks += 1
+		self.background.step(dt)
+		self.ground.step(dt)
+		if self.plane.alive:
+			self.plane.step(dt)
+		for body in self.obstacles:
+			if body.active:
+				body.step(dt)
+		self.sweep.prune()
+
+		self.spawn_timer += dt
+		if self.spawn_timer >= OBSTACLE_SPAWN_INTERVAL:
+			self.spawn_timer -= OBSTACLE_SPAWN_INTERVAL
+			if self.active:
+				self.spawn_obstacle()
+
+		if self.active:
+			self.session_ticks += 1
+			self.score = self.session_ticks // self.tick_rate + self.accumulated_score
+			self.collisions()
+
+	def collision_cause(self):
+		plane = self.plane
+		shape = plane.shape
+		ground = self.ground
+		if self.hitboxes.ground_field.hits(shape,plane.rect_x - ground.rect_x,plane.rect_y - ground.y):
+			return 'ground'
+		# only the obstacles level with the plane get a pixel test
+		for body in self.sweep.overlapping(plane.rect_x,plane.rect_x + shape.width):
+			if shape.overlap(body.shape,body.rect_x - plane.rect_x,body.rect_y - plane.rect_y):
+				return 'obstacle'
+		if plane.rect_y <= 0:
+			return 'ceiling'
+		return None
+
+	def collisions(self):
+		cause = self.collision_cause()
+		if cause:
+			self.clear_obstacles()
+			# freeze the current session score when the crash happens
+			self.current_session_score = self.session_ticks // self.tick_rate
+			self.crash_cause = cause
+			if self.telemetry:
+				self.telemetry.crash(cause,self.score)
+			self.active = False
+			self.quiz_mode = True
+			self.question = None
+			self.plane.alive = False
@@ -1,145 +1,132 @@
-import pygame, os ,sys
+import pygame
 from settings import *
-from random import choice, randint
+from assets import load_image, load_sound
 
-# Get the directory where this script is located
-#BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+class MovingSprite(pygame.sprite.Sprite):
+	"""Sprite drawn at its simulation body's position, between the body's last two steps"""
+	def interpolate(self,alpha):
+		body = self.body
+		self.rect.x = round(body.previous_x + (body.x - body.previous_x) * alpha)
+		self.rect.y = round(body.previous_y + (body.y - body.previous_y) * alpha)
 
-# Get the directory where this script is located. If running from a PyInstaller
-# one-file bundle the files are extracted to a temporary folder available at
-# `sys._MEIPASS`.
-if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-    BASE_DIR = sys._MEIPASS
-else:
-    BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-class BG(pygame.sprite.Sprite):
-	def __init__(self,groups,scale_factor):
+class BG(MovingSprite):
+	def __init__(self,groups,scale_factor,body):
 		super().__init__(groups)
-		bg_image = pygame.image.load(os.path.join(BASE_DIR, 'graphics', 'environment', 'background.png')).convert()
+		self.body = body
+		full_sized_image = load_image('graphics/environment/background.png',scale_factor,alpha = False)
+		full_width, full_height = full_sized_image.get_size()
 
-		full_height = bg_image.get_height() * scale_factor
-		full_width = bg_image.get_width() * scale_factor
-		full_sized_image = pygame.transform.scale(bg_image,(full_width,full_height))
-		
 		self.image = pygame.Surface((full_width * 2,full_height))
 		self.image.blit(full_sized_image,(0,0))
 		self.image.blit(full_sized_image,(full_width,0))
 
 		self.rect = self.image.get_rect(topleft = (0,0))
-		self.pos = pygame.math.Vector2(self.rect.topleft)
-
-	def update(self,dt):
-		self.pos.x -= 300 * dt
-		if self.rect.centerx <= 0:
-			self.pos.x = 0
-		self.rect.x = round(self.pos.x)
 
-class Ground(pygame.sprite.Sprite):
-	def __init__(self,groups,scale_factor):
+class Ground(MovingSprite):
+	def __init__(self,groups,scale_factor,body):
 		super().__init__(groups)
-		self.sprite_type = 'ground'
-		
+		self.body = body
+
 		# image
-		ground_surf = pygame.image.load(os.path.join(BASE_DIR, 'graphics', 'environment', 'ground.png')).convert_alpha()
-		self.image = pygame.transform.scale(ground_surf,pygame.math.Vector2(ground_surf.get_size()) * scale_factor)
-		
+		self.image = load_image('graphics/environment/ground.png',scale_factor)
+
 		# position
 		self.rect = self.image.get_rect(bottomleft = (0,WINDOW_HEIGHT))
-		self.pos = pygame.math.Vector2(self.rect.topleft)
-
-		# mask
-		self.mask = pygame.mask.from_surface(self.image)
-
-	def update(self,dt):
-		self.pos.x -= 360 * dt
-		if self.rect.centerx <= 0:
-			self.pos.x = 0
-
-		self.rect.x = round(self.pos.x)
 
-class Plane(pygame.sprite.Sprite):
-	def __init__(self,groups,scale_factor):
+class RotationCache:
+	"""Every frame pre-rendered at quantized angles"""
+	def __init__(self,frames,step = ROTATION_STEP,min_angle = ROTATION_MIN_ANGLE,max_angle = ROTATION_MAX_ANGLE):
+		self.step = step
+		self.min_angle = min_angle
+		self.last_bucket = int((max_angle - min_angle) / step)
+
+		# images[frame][bucket]
+		self.images = []
+		for frame in frames:
+			self.images.append([pygame.transform.rotozoom(frame,min_angle + bucket * step,1) for bucket in range(self.last_bucket + 1)])
+
+	def bucket(self,angle):
+		bucket = round((angle - self.min_angle) / self.step)
+		if bucket < 0:
+			return 0
+		if bucket > self.last_bucket:
+			return self.last_bucket
+		return bucket
+
+	def lookup(self,frame_index,angle):
+		return self.images[frame_index][self.bucket(angle)]
+
+# one rotation cache per scale factor, shared by every plane and the hitboxes
+_rotation_caches = {}
+
+def plane_frames(scale_factor):
+	return [load_image(f'graphics/drone/drone{i}.png',scale_factor) for i in range(3)]
+
+def rotation_cache(scale_factor):
+	if scale_factor not in _rotation_caches:
+		_rotation_caches[scale_factor] = RotationCache(plane_frames(scale_factor))
+	return _rotation_caches[scale_factor]
+
+class Plane(MovingSprite):
+	def __init__(self,groups,scale_factor,body):
 		super().__init__(groups)
+		self.body = body
 
-		# image 
-		self.import_frames(scale_factor)
-		self.frame_index = 0
-		self.image = self.frames[self.frame_index]
+		# image
+		self.frames = plane_frames(scale_factor)
+		self.rotation_cache = rotation_cache(scale_factor)
+		self.image = self.frames[0]
 
 		# rect
-		self.rect = self.image.get_rect(midleft = (WINDOW_WIDTH / 20,WINDOW_HEIGHT / 2))
-		self.pos = pygame.math.Vector2(self.rect.topleft)
-
-		# movement
-		self.gravity = 600
-		self.direction = 0
-
-		# mask
-		self.mask = pygame.mask.from_surface(self.image)
+		self.rect = self.image.get_rect(topleft = (body.x,body.y))
 
 		# sound
-		self.jump_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, 'sounds', 'jump.wav'))
-		self.jump_sound.set_volume(0.3)
-
-	def import_frames(self,scale_factor):
-		self.frames = []
-		for i in range(3):
-			surf = pygame.image.load(os.path.join(BASE_DIR, 'graphics', 'drone', f'drone{i}.png')).convert_alpha()
-			scaled_surface = pygame.transform.scale(surf,pygame.math.Vector2(surf.get_size())* scale_factor)
-			self.frames.append(scaled_surface)
-
-	def apply_gravity(self,dt):
-		self.direction += self.gravity * dt
-		self.pos.y += self.direction * dt
-		self.rect.y = round(self.pos.y)
+		self.jump_sound = load_sound('sounds/jump.wav',volume = 0.3)
 
 	def jump(self):
+		"""Jump sound, Simulation.jump moves the body"""
 		self.jump_sound.play()
-		self.direction = -400
-
-	def animate(self,dt):
-		self.frame_index += 10 * dt
-		if self.frame_index >= len(self.frames):
-			self.frame_index = 0
-		self.image = self.frames[int(self.frame_index)]
 
 	def rotate(self):
-		rotated_plane = pygame.transform.rotozoom(self.image,-self.direction * 0.06,1)
-		self.image = rotated_plane
-		self.mask = pygame.mask.from_surface(self.image)
+		self.image = self.rotation_cache.lookup(int(self.body.frame_index),self.body.angle)
 
-	def update(self,dt):
-		self.apply_gravity(dt)
-		self.animate(dt)
+	def interpolate(self,alpha):
+		super().interpolate(alpha)
 		self.rotate()
 
-class Obstacle(pygame.sprite.Sprite):
-	def __init__(self,groups,scale_factor):
+class Obstacle(MovingSprite):
+	def __init__(self,groups,scale_factor,body):
 		super().__init__(groups)
-		self.sprite_type = 'obstacle'
-
-		orientation = choice(('up','down'))
-		surf = pygame.image.load(os.path.join(BASE_DIR, 'graphics', 'obstacles', f'{choice((0,1))}.png')).convert_alpha()
-		self.image = pygame.transform.scale(surf,pygame.math.Vector2(surf.get_size()) * scale_factor)
-		
-		x = WINDOW_WIDTH + randint(40,100)
-
-		if orientation == 'up':
-			y = WINDOW_HEIGHT + randint(10,50)
-			self.rect = self.image.get_rect(midbottom = (x,y))
-		else:
-			y = randint(-50,-10)
-			self.image = pygame.transform.flip(self.image,False,True)
-			self.rect = self.image.get_rect(midtop = (x,y))
-
-		self.pos = pygame.math.Vector2(self.rect.topleft)
-
-		# mask
-		self.mask = pygame.mask.from_surface(self.image)
-
-	def update(self,dt):
-		self.pos.x -= 400 * dt
-		self.rect.x = round(self.pos.x)
-		if self.rect.right <= -100:
-			self.kill()
+		self.scale_factor = scale_factor
+		self.body = body
+		self.spawn_id = None
+
+	def reset(self):
+		"""Take the variant and orientation of the body's latest spawn"""
+		body = self.body
+		self.image = load_image(f'graphics/obstacles/{body.variant}.png',self.scale_factor,body.flip)
+		self.rect = self.image.get_rect(topleft = (body.rect_x,body.rect_y))
+		self.spawn_id = body.spawn_id
+
+	@staticmethod
+	def preload(scale_factor):
+		"""Warm the asset cache so the first spawn does not hit the disk"""
+		for variant in (0,1):
+			for flip in (False,True):
+				load_image(f'graphics/obstacles/{variant}.png',scale_factor,flip)
+
+class ObstaclePool:
+	"""One recycled sprite per simulation obstacle, shown while the obstacle is active"""
+	def __init__(self,groups,scale_factor,bodies):
+		self.groups = groups
+		self.obstacles = [Obstacle([],scale_factor,body) for body in bodies]
+
+	def sync(self):
+		for obstacle in self.obstacles:
+			body = obstacle.body
+			if body.active:
+				if obstacle.spawn_id != body.spawn_id:
+					obstacle.reset()
+					obstacle.add(self.groups)
+			elif obstacle.alive():
+				obstacle.kill()
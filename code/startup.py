@@ -0,0 +1,91 @@
+"""Startup timing: time to first frame and time to interactive.
+
+main.py and main_web.py import this module before anything else, so the
+clock starts as close to process start as Python code can get. The game
+shows its start screen first and loads the rest over the next frames
+(Game.load_stages); StartupTimer records when the first frame was presented,
+how long each loading stage took and when the game accepted input.
+
+With FLAPPY_STARTUP_LOG set every launch appends its timings there as a JSON
+line. Run this module to measure fresh launches for a release check:
+
+Usage: python startup.py [--runs 5] [--budget-ms 500] [--game main.py]
+"""
+import time
+
+PROCESS_START = time.perf_counter()
+
+import argparse, json, os, subprocess, sys, tempfile
+from settings import *
+
+def elapsed_ms():
+	return (time.perf_counter() - PROCESS_START) * 1000
+
+class StartupTimer:
+	def __init__(self):
+		self.first_frame = None
+		self.interactive = None
+		self.stages = {}
+		self.stage_start = elapsed_ms()
+
+	def stage(self,name):
+		"""A loading stage just finished"""
+		now = elapsed_ms()
+		self.stages[name] = round(now - self.stage_start,2)
+		self.stage_start = now
+
+	def frame_presented(self):
+		"""A loading frame is on screen, the next stage starts now"""
+		if self.first_frame is None:
+			self.first_frame = round(elapsed_ms(),2)
+		self.stage_start = elapsed_ms()
+
+	def loaded(self):
+		"""Everything is loaded and the game takes input"""
+		self.interactive = round(elapsed_ms(),2)
+		if STARTUP_LOG:
+			with open(STARTUP_LOG,'a') as file:
+				file.write(json.dumps(self.report()) + '\n')
+
+	def report(self):
+		return {'first_frame_ms': self.first_frame, 'interactive_ms': self.interactive, 'stages_ms': self.stages}
+
+def median(values):
+	values = sorted(values)
+	middle = len(values) // 2
+	return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(description = 'Measure time to first frame and time to interactive over fresh launches.')
+	parser.add_argument('--runs',type = int,default = 5)
+	parser.add_argument('--budget-ms',type = float,help = 'fail when the median time to interactive is above this')
+	parser.add_argument('--game',default = 'main.py')
+	args = parser.parse_args(argv)
+
+	here = os.path.dirname(os.path.abspath(__file__))
+	with tempfile.TemporaryDirectory() as folder:
+		log = os.path.join(folder,'startup.jsonl')
+		env = dict(os.environ,FLAPPY_STARTUP_LOG = log,FLAPPY_STARTUP_EXIT = '1')
+		for _ in range(args.runs):
+			subprocess.run([sys.executable,os.path.join(here,args.game)],env = env,check = True,stdout = subprocess.DEVNULL)
+		with open(log) as file:
+			runs = [json.loads(line) for line in file]
+
+	print(f'⏱️  {args.game}, {len(runs)} launches (median / max)')
+	for key in ('first_frame_ms','interactive_ms'):
+		values = [run[key] for run in runs]
+		print(f'   {key:<16} {median(values):8.1f} {max(values):8.1f}')
+	for stage in runs[0]['stages_ms']:
+		values = [run['stages_ms'][stage] for run in runs]
+		print(f'   stage {stage:<10} {median(values):8.1f} {max(values):8.1f}')
+
+	if args.budget_ms is not None:
+		interactive = median(run['interactive_ms'] for run in runs)
+		if interactive > args.budget_ms:
+			print(f'❌ time to interactive {interactive:.1f} ms is over the {args.budget_ms:.0f} ms budget')
+			return 1
+		print(f'✅ time to interactive within the {args.budget_ms:.0f} ms budget')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
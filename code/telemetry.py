@@ -0,0 +1,217 @@
+"""Gameplay telemetry: fixed-size binary events, buffered in memory, written by a background thread.
+
+Every event is one EVENT record (little endian, 24 bytes):
+	time (f64, unix seconds), session (u32), kind (u8), 3 pad bytes,
+	a (i32), b (f32), meaning per kind:
+	SESSION_START  a: -, b: -
+	SESSION_END  a: events dropped, b: session length in seconds
+	JUMP     a: tick, b: -
+	CRASH    a: cause (CAUSES), b: score at the crash
+	ANSWER   a: question position, b: response time in seconds, negative when wrong
+	RESTART  a: score before the restart, b: -
+
+The frame thread only packs events into a preallocated ring buffer: no
+locks, no file access, no syscalls. The
+writer thread wakes every FLUSH_INTERVAL, copies out what is new and
+appends it to TELEMETRY_DIR/events-<day>-<time>.bin, starting a new file
+past TELEMETRY_FILE_SIZE. Events that arrive while the buffer is full are
+dropped and counted, the count goes out with the session's end.
+
+Usage: python telemetry.py [--day YYYYMMDD] [dir] aggregates a day of logs.
+"""
+import argparse, os, random, struct, sys, threading, time
+from collections import Counter
+from settings import *
+
+MAGIC = b'FLTE'
+VERSION = 1
+_FILE_HEADER = struct.Struct('<4sHH')
+EVENT = struct.Struct('<dIB3xif')
+
+SESSION_START, SESSION_END, JUMP, CRASH, ANSWER, RESTART = range(6)
+KINDS = ('session_start','session_end','jump','crash','answer','restart')
+CAUSES = ('ground','obstacle','ceiling')
+
+CAPACITY = 4096
+FLUSH_INTERVAL = 1
+
+class Telemetry:
+	def __init__(self,directory = TELEMETRY_DIR,capacity = CAPACITY,file_size = TELEMETRY_FILE_SIZE):
+		self.directory = directory
+		self.capacity = capacity
+		self.file_size = file_size
+		self.buffer = bytearray(capacity * EVENT.size)
+		# single producer (frame thread) and single consumer (writer): each index has one owner
+		self.written = 0
+		self.read = 0
+		self.dropped = 0
+		self.session = random.getrandbits(32)
+		self.started = time.time()
+		self.file = None
+		self.running = bool(directory)
+		self.stop = threading.Event()
+		self.thread = None
+		if self.running:
+			self.thread = threading.Thread(target = self.run,name = 'telemetry',daemon = True)
+			self.thread.start()
+			self.emit(SESSION_START)
+
+	def emit(self,kind,a = 0,b = 0.0):
+		if not self.running:
+			return
+		if self.written - self.read >= self.capacity:
+			self.dropped += 1
+			return
+		EVENT.pack_into(self.buffer,(self.written % self.capacity) * EVENT.size,time.time(),self.session,kind,a,b)
+		self.written += 1
+
+	# hooks
+	def jump(self,tick):
+		self.emit(JUMP,tick)
+
+	def crash(self,cause,score):
+		self.emit(CRASH,CAUSES.index(cause),score)
+
+	def answer(self,question,correct,latency):
+		self.emit(ANSWER,question,latency if correct else -latency)
+
+	def restart(self,score):
+		self.emit(RESTART,score)
+
+	def close(self,timeout = 1):
+		"""End the session and write everything still buffered"""
+		if not self.running:
+			return
+		self.stop.set()
+		self.thread.join(timeout)
+		if not self.thread.is_alive():
+			# the writer has stopped, the rest is written from here: first what is
+			# buffered, so the end event always has room
+			self.flush()
+			self.emit(SESSION_END,self.dropped,time.time() - self.started)
+			self.flush()
+			if self.file:
+				self.file.close()
+		# else stuck on a slow disk, the rest of the session is lost
+		self.running = False
+
+	# writer thread
+	def run(self):
+		while not self.stop.wait(FLUSH_INTERVAL):
+			self.flush()
+
+	def flush(self):
+		written = self.written
+		if written == self.read:
+			return
+		start = self.read % self.capacity
+		end = written % self.capacity
+		if start < end:
+			data = bytes(self.buffer[start * EVENT.size:end * EVENT.size])
+		else:
+			data = bytes(self.buffer[start * EVENT.size:]) + bytes(self.buffer[:end * EVENT.size])
+		self.read = written
+		try:
+			self.output().write(data)
+			self.file.flush()
+		except OSError:
+			# a full disk must not take the game down, the events are lost
+			self.file = None
+
+	def output(self):
+		if self.file is None or self.file.tell() >= self.file_size:
+			if self.file:
+				self.file.close()
+			os.makedirs(self.directory,exist_ok = True)
+			name = time.strftime('events-%Y%m%d-%H%M%S') + f'-{self.session:08x}.bin'
+			path = os.path.join(self.directory,name)
+			# same second after a rotation
+			while os.path.exists(path):
+				path = path[:-len('.bin')] + '+.bin'
+			self.file = open(path,'wb')
+			self.file.write(_FILE_HEADER.pack(MAGIC,VERSION,EVENT.size))
+		return self.file
+
+# reader
+def read_events(path):
+	"""The events of one log file as (time,session,kind,a,b) tuples"""
+	with open(path,'rb') as file:
+		data = file.read()
+	if len(data) < _FILE_HEADER.size:
+		return []
+	magic, version, size = _FILE_HEADER.unpack_from(data)
+	if magic != MAGIC or version != VERSION or size != EVENT.size:
+		raise ValueError(f'{path}: not a telemetry log')
+	# a file cut short by a crash ends in a partial event, skip it
+	end = _FILE_HEADER.size + (len(data) - _FILE_HEADER.size) // EVENT.size * EVENT.size
+	return EVENT.iter_unpack(memoryview(data)[_FILE_HEADER.size:end])
+
+def aggregate(paths):
+	kinds = Counter()
+	causes = Counter()
+	first, last, ended = {}, {}, {}
+	correct = wrong = dropped = 0
+	latency = 0.0
+	for path in paths:
+		for when, session, kind, a, b in read_events(path):
+			kinds[kind] += 1
+			if session not in first:
+				first[session] = when
+			last[session] = when
+			if kind == CRASH:
+				causes[CAUSES[a] if 0 <= a < len(CAUSES) else a] += 1
+			elif kind == ANSWER:
+				if b >= 0:
+					correct += 1
+				else:
+					wrong += 1
+				latency += abs(b)
+			elif kind == SESSION_END:
+				ended[session] = b
+				dropped += a
+	# sessions without an end event (killed, crashed) last until their last event
+	lengths = [ended.get(session,last[session] - first[session]) for session in first]
+	return {
+		'events': sum(kinds.values()),
+		'kinds': {KINDS[kind]: count for kind, count in kinds.items()},
+		'sessions': len(first),
+		'session_seconds': sum(lengths),
+		'causes': dict(causes),
+		'correct': correct,
+		'wrong': wrong,
+		'latency': latency,
+		'dropped': dropped}
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(description = 'Aggregate a day of telemetry logs.')
+	parser.add_argument('directory',nargs = '?',default = TELEMETRY_DIR or 'telemetry')
+	parser.add_argument('--day',default = time.strftime('%Y%m%d'),help = 'YYYYMMDD, default today')
+	args = parser.parse_args(argv)
+
+	prefix = f'events-{args.day}-'
+	# telemetry off or nothing logged yet
+	names = os.listdir(args.directory) if os.path.isdir(args.directory) else []
+	paths = sorted(os.path.join(args.directory,name) for name in names if name.startswith(prefix))
+	if not paths:
+		print(f'📈 {args.day}: no events in {args.directory}')
+		return 0
+	start = time.perf_counter()
+	stats = aggregate(paths)
+	elapsed = time.perf_counter() - start
+
+	print(f'📈 {args.day}: {stats["events"]} events in {len(paths)} files ({elapsed:.2f}s)')
+	sessions = stats['sessions']
+	print(f'   sessions     {sessions}, {stats["session_seconds"] / max(sessions,1):.0f}s on average')
+	minutes = stats['session_seconds'] / 60
+	print(f'   jumps        {stats["kinds"].get("jump",0)} ({stats["kinds"].get("jump",0) / minutes if minutes else 0:.1f} per minute)')
+	crashes = sum(stats['causes'].values())
+	print(f'   crashes      {crashes} ' + ' '.join(f'{cause} {count / crashes:.0%}' for cause, count in sorted(stats['causes'].items())))
+	answers = stats['correct'] + stats['wrong']
+	if answers:
+		print(f'   quiz         {answers} answers, {stats["correct"] / answers:.0%} right, {stats["latency"] / answers:.1f}s to answer')
+	print(f'   restarts     {stats["kinds"].get("restart",0)}')
+	print(f'   dropped      {stats["dropped"]} events (buffer full)')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
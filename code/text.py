@@ -0,0 +1,52 @@
+"""Text is rasterized once and reused until it changes.
+
+TextCache keeps rendered strings, DigitAtlas draws numbers (the ticking score)
+from one pre-rendered surface per digit.
+"""
+import pygame
+from collections import OrderedDict
+from settings import *
+
+class TextCache:
+	"""Rendered text by (font,text,color), the least recently used entries are evicted first
+
+	Fonts come from assets.load_font, one object per (path,size), so the font
+	object stands in for its size in the key.
+	"""
+	def __init__(self,max_size = TEXT_CACHE_SIZE):
+		self.max_size = max_size
+		self.surfaces = OrderedDict()
+
+	def render(self,font,text,color):
+		key = (font,text,color)
+		surface = self.surfaces.get(key)
+		if surface is None:
+			surface = font.render(text,True,color)
+			self.surfaces[key] = surface
+			if len(self.surfaces) > self.max_size:
+				self.surfaces.popitem(last = False)
+		else:
+			self.surfaces.move_to_end(key)
+		return surface
+
+class DigitAtlas:
+	"""Every digit rendered once, numbers are blitted glyph by glyph"""
+	def __init__(self,font,color):
+		self.glyphs = [font.render(str(digit),True,color) for digit in range(10)]
+		self.widths = [glyph.get_width() for glyph in self.glyphs]
+		self.height = max(glyph.get_height() for glyph in self.glyphs)
+
+	def digits(self,number):
+		return [ord(char) - 48 for char in str(number)]
+
+	def blit(self,surface,number,**anchor):
+		"""Draw a non-negative number positioned like get_rect(**anchor), returns its rect"""
+		digits = self.digits(number)
+		rect = pygame.Rect(0,0,sum(self.widths[digit] for digit in digits),self.height)
+		for name, position in anchor.items():
+			setattr(rect,name,position)
+		x = rect.x
+		for digit in digits:
+			surface.blit(self.glyphs[digit],(x,rect.y))
+			x += self.widths[digit]
+		return rect
@@ -0,0 +1,234 @@
+"""Score autopilot policies over many seeded headless games, on every core.
+
+A policy is a function policy(sim,rng) -> bool called once per tick while the
+plane flies; True makes it jump. Built-in policies are listed in POLICIES,
+any other can be given as module:function. After a crash the bot answers the
+quiz correctly with probability --quiz-accuracy and keeps flying until it
+answers wrong (game over) or --max-ticks runs out.
+
+Results are appended to the output file (.jsonl or .csv) as games finish.
+Running the same command again skips the seeds already in the file for the
+same policy, quiz accuracy and tick limit, so an interrupted tournament
+resumes where it stopped; rows played with other settings stay in the file
+but are left out of the report.
+
+Usage: python tournament.py --policy autopilot --games 10000 --out results.jsonl
+"""
+import argparse, csv, importlib, json, os, random, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from settings import *
+from simulation import Simulation
+
+FIELDS = ('seed','policy','quiz_accuracy','max_ticks','score','survival_ticks','questions_answered','crash_cause','ticks')
+
+# policies
+def idle(sim,rng):
+	return False
+
+def random_jumps(sim,rng):
+	return rng.random() < 0.03
+
+def autopilot(sim,rng):
+	"""Hold the middle of the screen, climb over / dive under the next obstacle"""
+	plane = sim.plane
+	target = WINDOW_HEIGHT / 2
+	for body in sim.obstacles:
+		if body.active and body.rect_x + body.shape.width > plane.rect_x:
+			if body.flip:
+				target = max(target,body.rect_y + body.shape.height + plane.height * 2)
+			else:
+				target = min(target,body.rect_y - plane.height)
+			break
+	return plane.rect_y + plane.height > target and plane.velocity > 0
+
+POLICIES = {'idle': idle, 'random': random_jumps, 'autopilot': autopilot}
+
+def load_policy(name):
+	if name in POLICIES:
+		return POLICIES[name]
+	module, _, function = name.partition(':')
+	if not function:
+		raise ValueError(f'unknown policy {name!r}, use one of {", ".join(POLICIES)} or module:function')
+	return getattr(importlib.import_module(module),function)
+
+# workers
+_worker = {}
+
+def _init_worker(policy_name,quiz_accuracy,max_ticks):
+	from hitboxes import load_hitboxes
+	from questions import QuestionBank
+	_worker.update(
+		hitboxes = load_hitboxes(),
+		questions = QuestionBank.open(),
+		policy_name = policy_name,
+		policy = load_policy(policy_name),
+		quiz_accuracy = quiz_accuracy,
+		max_ticks = max_ticks)
+
+def play_game(seed):
+	"""Play one seeded game to game over, returns its result row"""
+	sim = Simulation(_worker['hitboxes'],_worker['questions'],seed)
+	policy = _worker['policy']
+	quiz_accuracy = _worker['quiz_accuracy']
+	max_ticks = _worker['max_ticks']
+	# the bot's own randomness is seeded too, so results are reproducible
+	rng = random.Random(seed)
+
+	survival_ticks = answered = 0
+	crash_cause = 'timeout'
+	sim.start()
+	while sim.ticks < max_ticks:
+		if sim.active:
+			if policy(sim,rng):
+				sim.jump()
+			sim.step()
+			survival_ticks += sim.active
+		elif sim.quiz_mode:
+			correct = sim.current_question_data()['correct']
+			if rng.random() < quiz_accuracy:
+				sim.answer(correct)
+				answered += 1
+			else:
+				crash_cause = sim.crash_cause
+				sim.answer((correct + 1) % 3)
+				break
+
+	return {
+		'seed': seed,
+		'policy': _worker['policy_name'],
+		'quiz_accuracy': quiz_accuracy,
+		'max_ticks': max_ticks,
+		'score': sim.score,
+		'survival_ticks': survival_ticks,
+		'questions_answered': answered,
+		'crash_cause': crash_cause,
+		'ticks': sim.ticks}
+
+def play_games(seeds):
+	return [play_game(seed) for seed in seeds]
+
+# output
+class ResultFile:
+	"""Append-only .jsonl / .csv of result rows that tolerates a torn last line"""
+	def __init__(self,path):
+		self.path = path
+		self.csv = path.endswith('.csv')
+		self.rows = self.read()
+		self.file = open(path,'a',newline = '')
+		if self.csv:
+			self.writer = csv.DictWriter(self.file,FIELDS)
+			# a new file, an existing one already starts with its header
+			if os.path.getsize(path) == 0:
+				self.writer.writeheader()
+
+	def read(self):
+		if not os.path.exists(self.path):
+			return []
+		with open(self.path,'rb') as file:
+			data = file.read()
+		# an interrupted run can leave half a line behind, drop it
+		complete = data[:data.rfind(b'\n') + 1]
+		if len(complete) != len(data):
+			with open(self.path,'r+b') as file:
+				file.truncate(len(complete))
+		lines = complete.decode().splitlines()
+		if self.csv:
+			reader = csv.DictReader(lines)
+			if reader.fieldnames is not None and tuple(reader.fieldnames) != FIELDS:
+				raise ValueError(f'{self.path} has columns {",".join(reader.fieldnames)}, expected {",".join(FIELDS)}')
+			# files written before headers were only written once can repeat them
+			rows = [row for row in reader if row['seed'] != 'seed']
+			for row in rows:
+				for field in ('seed','max_ticks','score','survival_ticks','questions_answered','ticks'):
+					row[field] = int(row[field])
+				row['quiz_accuracy'] = float(row['quiz_accuracy'])
+			return rows
+		return [json.loads(line) for line in lines if line]
+
+	def write(self,rows):
+		for row in rows:
+			if self.csv:
+				self.writer.writerow(row)
+			else:
+				self.file.write(json.dumps(row) + '\n')
+		self.file.flush()
+		self.rows.extend(rows)
+
+	def close(self):
+		self.file.close()
+
+# report
+def percentile(values,p):
+	"""Nearest-rank percentile of sorted values"""
+	index = max(0,min(len(values) - 1,round(p / 100 * len(values)) - 1))
+	return values[index]
+
+def report(rows):
+	print(f'📊 {len(rows)} games')
+	if not rows:
+		return
+	for field in ('score','survival_ticks','questions_answered'):
+		values = sorted(row[field] for row in rows)
+		mean = sum(values) / len(values)
+		print(f'   {field:<20} mean {mean:9.1f}  p50 {percentile(values,50):7}  p90 {percentile(values,90):7}  '
+			f'p99 {percentile(values,99):7}  max {values[-1]:7}')
+	causes = {}
+	for row in rows:
+		causes[row['crash_cause']] = causes.get(row['crash_cause'],0) + 1
+	print('   crash causes         ' + '  '.join(f'{cause} {count / len(rows):.1%}' for cause, count in sorted(causes.items())))
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(description = 'Run a policy over many seeded headless games.')
+	parser.add_argument('--policy',default = 'autopilot',help = f'{", ".join(POLICIES)} or module:function')
+	parser.add_argument('--games',type = int,default = 1000)
+	parser.add_argument('--first-seed',type = int,default = 0)
+	parser.add_argument('--out',default = 'tournament.jsonl',help = 'results file, .jsonl or .csv')
+	parser.add_argument('--workers',type = int,default = os.cpu_count())
+	parser.add_argument('--chunk',type = int,default = 20,help = 'games per task')
+	parser.add_argument('--quiz-accuracy',type = float,default = 0.8)
+	parser.add_argument('--max-ticks',type = int,default = TICK_RATE * 600)
+	args = parser.parse_args(argv)
+
+	load_policy(args.policy)
+	try:
+		results = ResultFile(args.out)
+	except ValueError as error:
+		parser.error(str(error))
+	# only games played with the same settings count as done
+	key = (args.policy,args.quiz_accuracy,args.max_ticks)
+	same = lambda row: (row['policy'],row.get('quiz_accuracy'),row.get('max_ticks')) == key
+	done = {row['seed'] for row in results.rows if same(row)}
+	seeds = [seed for seed in range(args.first_seed,args.first_seed + args.games) if seed not in done]
+	if done:
+		print(f'↩️  {args.games - len(seeds)} games already in {args.out}, resuming')
+
+	start = time.perf_counter()
+	played = 0
+	try:
+		with ProcessPoolExecutor(args.workers,initializer = _init_worker,
+				initargs = (args.policy,args.quiz_accuracy,args.max_ticks)) as executor:
+			futures = [executor.submit(play_games,seeds[i:i + args.chunk]) for i in range(0,len(seeds),args.chunk)]
+			try:
+				for future in as_completed(futures):
+					rows = future.result()
+					results.write(rows)
+					played += len(rows)
+					print(f'\r🎮 {played}/{len(seeds)} games',end = '',flush = True)
+			except KeyboardInterrupt:
+				for future in futures:
+					future.cancel()
+				print(f'\n⏹️  interrupted, rerun the same command to resume')
+				raise
+	finally:
+		results.close()
+
+	elapsed = time.perf_counter() - start
+	if played:
+		print(f'\n⏱️  {played} games in {elapsed:.1f}s ({played / elapsed:.0f} games/s, {args.workers} workers)')
+	report([row for row in results.rows if same(row)])
+
+if __name__ == '__main__':
+	try:
+		main()
+	except KeyboardInterrupt:
+		sys.exit(130)
@@ -0,0 +1,35 @@
+import pygame
+from settings import *
+from sprites import BG, Ground, Plane, Obstacle, ObstaclePool
+
+class WorldView:
+	"""Draws a Simulation with pygame sprites, shared by main.py and main_web.py"""
+	def __init__(self,sim,scale_factor):
+		self.sim = sim
+
+		# sprite setup
+		self.all_sprites = pygame.sprite.Group()
+		BG(self.all_sprites,scale_factor,sim.background)
+		Ground(self.all_sprites,scale_factor,sim.ground)
+		self.plane = Plane([],scale_factor / 1.7,sim.plane)
+		Obstacle.preload(scale_factor * 1.1)
+		self.obstacles = ObstaclePool(self.all_sprites,scale_factor * 1.1,sim.obstacles)
+
+	def jump(self):
+		if self.sim.jump():
+			self.plane.jump()
+
+	def sync(self):
+		"""Show / hide sprites to match the simulation"""
+		if self.sim.plane.alive and not self.plane.alive():
+			self.plane.add(self.all_sprites)
+		elif not self.sim.plane.alive and self.plane.alive():
+			self.plane.kill()
+		self.obstacles.sync()
+
+	def draw(self,surface,alpha):
+		"""Draw the world interpolated between the last two simulation steps"""
+		self.sync()
+		for sprite in self.all_sprites:
+			sprite.interpolate(alpha)
+		self.all_sprites.draw(surface)
@@ -1,75 +1,158 @@
 #!/usr/bin/env python3
 """
-Audio converter for FlappyBird web compatibility
-Converts WAV files to OGG format for pygbag web deployment
+Audio converter for FlappyBird
+Converts WAV files to OGG with a codec/bitrate profile per target:
+- web: small files for the pygbag build (see build_web.py)
+- desktop: higher bitrate for the executables
+
+Conversion is incremental: a manifest in each output directory records the
+content hash of every source and the profile it was encoded with, unchanged
+files are skipped. The rest are converted in parallel across processes.
+
+Usage: python convert_audio.py [--profile web|desktop|all] [--jobs N] [--force] [sounds_dir]
 """
 
+import argparse
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pydub import AudioSegment
 
-def convert_wav_to_ogg(input_dir, output_dir):
-    """Convert WAV files to OGG format"""
-    
-    # Create output directory if it doesn't exist
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-    
-    print("🎵 Converting audio files for web compatibility...")
-    
-    # Get all WAV files
-    wav_files = [f for f in os.listdir(input_dir) if f.endswith('.wav')]
-    
+PROFILES = {
+    'web': {'format': 'ogg', 'codec': 'libvorbis', 'bitrate': '96k'},
+    'desktop': {'format': 'ogg', 'codec': 'libvorbis', 'bitrate': '192k'},
+}
+
+# converted files are kept between runs, one directory per profile
+CACHE_DIR = '.audio_cache'
+MANIFEST = 'manifest.json'
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST)
+    with open(path + '.tmp', 'w') as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+def convert_file(input_path, output_path, profile):
+    """Encode one file (runs in a worker process), returns the seconds it took"""
+    start = time.perf_counter()
+    audio = AudioSegment.from_wav(input_path)
+    audio.export(output_path, format=profile['format'], codec=profile['codec'], bitrate=profile['bitrate'])
+    return time.perf_counter() - start
+
+def convert_wav_to_ogg(input_dir, output_dir=None, profile='web', jobs=None, force=False):
+    """Convert the WAV files in input_dir that changed since the last run
+
+    Returns the output directory, or None when there was nothing to convert or
+    any file failed to convert.
+    """
+    settings = PROFILES[profile]
+    output_dir = output_dir or os.path.join(CACHE_DIR, profile)
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"🎵 Converting audio files ({profile}: {settings['codec']} {settings['bitrate']})...")
+
+    wav_files = sorted(f for f in os.listdir(input_dir) if f.endswith('.wav'))
     if not wav_files:
         print("❌ No WAV files found in", input_dir)
-        return False
-    
-    converted_files = []
-    
+        return None
+
+    start = time.perf_counter()
+    manifest = load_manifest(output_dir)
+    todo = {}
+    skipped = []
     for wav_file in wav_files:
-        try:
-            input_path = os.path.join(input_dir, wav_file)
-            output_filename = wav_file.replace('.wav', '.ogg')
-            output_path = os.path.join(output_dir, output_filename)
-            
-            print(f"   Converting: {wav_file} → {output_filename}")
-            
-            # Load and convert
-            audio = AudioSegment.from_wav(input_path)
-            audio.export(output_path, format="ogg")
-            
-            # Check file sizes
-            input_size = os.path.getsize(input_path) / 1024  # KB
-            output_size = os.path.getsize(output_path) / 1024  # KB
-            compression = ((input_size - output_size) / input_size) * 100
-            
-            print(f"   ✅ {output_filename} created ({output_size:.1f}KB, {compression:.1f}% compression)")
-            converted_files.append(output_filename)
-            
-        except Exception as e:
-            print(f"   ❌ Failed to convert {wav_file}: {e}")
-    
-    print(f"\n🎉 Converted {len(converted_files)} audio files!")
-    print(f"📂 Web-compatible audio files in: {output_dir}")
-    return len(converted_files) > 0
+        input_path = os.path.join(input_dir, wav_file)
+        output_filename = wav_file[:-len('.wav')] + '.' + settings['format']
+        entry = {'hash': file_hash(input_path), 'profile': settings, 'output': output_filename}
+        cached = manifest.get(wav_file)
+        if (not force and cached and all(cached.get(key) == value for key, value in entry.items())
+                and os.path.exists(os.path.join(output_dir, output_filename))):
+            skipped.append(wav_file)
+        else:
+            todo[wav_file] = entry
+
+    failed = []
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {wav_file: pool.submit(convert_file, os.path.join(input_dir, wav_file),
+                                             os.path.join(output_dir, entry['output']), settings)
+                       for wav_file, entry in todo.items()}
+            for wav_file, future in futures.items():
+                entry = todo[wav_file]
+                try:
+                    entry['seconds'] = round(future.result(), 3)
+                except Exception as e:
+                    print(f"   ❌ Failed to convert {wav_file}: {e}")
+                    manifest.pop(wav_file, None)
+                    failed.append(wav_file)
+                    # a stale or half-written output must not ship as if it were converted
+                    try:
+                        os.remove(os.path.join(output_dir, entry['output']))
+                    except FileNotFoundError:
+                        pass
+                    continue
+                entry['input_size'] = os.path.getsize(os.path.join(input_dir, wav_file))
+                entry['output_size'] = os.path.getsize(os.path.join(output_dir, entry['output']))
+                manifest[wav_file] = entry
+                print(f"   ✅ {wav_file} → {entry['output']} ({entry['output_size'] / 1024:.1f}KB, {entry['seconds']:.2f}s)")
+
+    # sources that are gone take their manifest entries with them
+    for wav_file in [name for name in manifest if name not in wav_files]:
+        del manifest[wav_file]
+    save_manifest(output_dir, manifest)
+
+    converted = [wav_file for wav_file in todo if wav_file not in failed]
+    input_size = sum(manifest[name]['input_size'] for name in manifest)
+    output_size = sum(manifest[name]['output_size'] for name in manifest)
+    cache_seconds = sum(manifest[name]['seconds'] for name in skipped)
+    print(f"\n📊 {len(converted)} converted, {len(skipped)} up to date, {len(failed)} failed "
+          f"in {time.perf_counter() - start:.2f}s (cache saved ~{cache_seconds:.2f}s)")
+    if input_size:
+        print(f"   {input_size / 1024:.0f}KB of WAV → {output_size / 1024:.0f}KB "
+              f"({(input_size - output_size) / 1024:.0f}KB saved, {(1 - output_size / input_size) * 100:.1f}%)")
+    print(f"📂 {profile} audio files in: {output_dir}")
+    if failed:
+        return None
+    return output_dir if manifest else None
 
 def main():
     """Main conversion function"""
+    parser = argparse.ArgumentParser(description='Convert WAV files to OGG, skipping the ones already converted.')
+    parser.add_argument('sounds_dir', nargs='?', default='sounds')
+    parser.add_argument('--profile', choices=sorted(PROFILES) + ['all'], default='web')
+    parser.add_argument('--jobs', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='convert every file again')
+    args = parser.parse_args()
+
     print("🎮 FlappyBird Audio Converter")
     print("=" * 40)
-    
-    # Convert original sounds to web format
-    sounds_dir = "sounds"
-    web_sounds_dir = "code/sounds_web"
-    
-    success = convert_wav_to_ogg(sounds_dir, web_sounds_dir)
-    
-    if success:
-        print("\n📋 Next steps:")
-        print("   1. Audio files converted to OGG format")
-        print("   2. Web-compatible files created in code/sounds_web/")
-        print("   3. Ready for pygbag web deployment!")
-    else:
+
+    profiles = sorted(PROFILES) if args.profile == 'all' else [args.profile]
+    success = True
+    for profile in profiles:
+        success = convert_wav_to_ogg(args.sounds_dir, profile=profile, jobs=args.jobs, force=args.force) and success
+
+    if not success:
         print("\n❌ Audio conversion failed!")
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
@@ -9,7 +9,7 @@ source .venv/bin/activate
 
 # Package for current platform (macOS)
 echo "📦 Creating macOS distribution..."
-pyinstaller --clean FlappyBird.spec --noconfirm
+python build_game.py
 
 # Check if build was successful
 if [ -d "dist/FlappyBird" ] && [ -d "dist/FlappyBird.app" ]; then
@@ -60,6 +60,10 @@ def package_windows():
         print("❌ Windows executable not found. Build it first with:")
         print("   python build_game.py")
         return False
+    if not os.path.exists("dist/assets.pak"):
+        print("❌ Asset pack not found, the executable cannot start without it. Build it first with:")
+        print("   python build_game.py")
+        return False
     
     # Create package directory
     package_dir = "FlappyBird-Windows"
@@ -69,6 +73,8 @@ def package_windows():
     
     # Copy executable
     shutil.copy2("dist/FlappyBird.exe", package_dir)
+    # the exe reads every asset from the pack next to it
+    shutil.copy2("dist/assets.pak", package_dir)
     
     # Create README
     with open(f"{package_dir}/README.txt", "w") as f: